@@ -0,0 +1,200 @@
+from Findings import Finding
+from HelperFunc import HelperFunctions
+
+
+class ColumnExpressions:
+    """
+    Memoized column expressions for a single sheet.
+
+    Rules build their predicates from these helpers, so a sub-expression such as
+    isna('CR-ID_Bosch_PPx') or eq('Typ', 'Anforderung,') is computed once per
+    sheet no matter how many rules use it. The text comparison checks share the
+    normalized and fingerprinted text columns the same way.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._cache = {}
+
+    def _memo(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def isna(self, column):
+        return self._memo(('isna', column), lambda: self.df[column].isna())
+
+    def notna(self, column):
+        return self._memo(('notna', column), lambda: ~self.isna(column))
+
+    def eq(self, column, value):
+        return self._memo(('eq', column, value),
+                          lambda: self.df[column] == value)
+
+    def ne(self, column, value):
+        # NaN never equals a value, so the negation keeps NaN rows as "not equal"
+        return self._memo(('ne', column, value),
+                          lambda: ~self.eq(column, value))
+
+    def isin(self, column, values):
+        values = tuple(values)
+        return self._memo(('isin', column, values),
+                          lambda: self.df[column].isin(values))
+
+    def lower(self, column):
+        """Lower-cased string form of a column (NaN becomes 'nan')."""
+        return self._memo(('lower', column),
+                          lambda: self.df[column].astype(str).str.lower())
+
+    def normalized(self, column, stringify=False):
+        """Column normalized like HelperFunctions.normalize_text (see normalize_series)."""
+        return self._memo(('normalized', column, stringify),
+                          lambda: HelperFunctions.normalize_series(
+                              self.df[column], stringify))
+
+    def fingerprints(self, column, stringify=False):
+        """Fingerprints of the normalized column (see HelperFunctions.fingerprint_series)."""
+        return self._memo(('fingerprints', column, stringify),
+                          lambda: HelperFunctions.fingerprint_series(
+                              self.df[column], stringify))
+
+
+class CheckRule:
+    """
+    Declarative description of a single-sheet check.
+
+    Args:
+        rule_id (str): Unique name of the check, used in warnings and reports
+        project (str): Project the rule belongs to (CheckConfiguration.PROJECT value)
+        check_type (int): CheckConfiguration.IMPORT_CHECK or EXPORT_CHECK
+        required_columns (list): Columns that must exist for the rule to run
+        predicate (callable): Takes a ColumnExpressions and returns a boolean mask
+        attribute (str): Template for the 'Attribute' field of a finding
+        issue (str): Template for the 'Issue' field of a finding
+        value (str): Template for the 'Value' field of a finding
+        severity (str, optional): Severity reported with each finding. Defaults to "Error".
+        fields (callable, optional): Takes the row values (dict keyed by column)
+            and returns extra template fields for that row
+    """
+
+    def __init__(self, rule_id, project, check_type, required_columns,
+                 predicate, attribute, issue, value, severity="Error",
+                 fields=None):
+        self.rule_id = rule_id
+        self.project = project
+        self.check_type = check_type
+        self.required_columns = list(required_columns)
+        self.predicate = predicate
+        self.attribute = attribute
+        self.issue = issue
+        self.value = value
+        self.severity = severity
+        self.fields = fields
+
+    def missing_columns(self, df):
+        return [col for col in self.required_columns if col not in df.columns]
+
+    def build_findings(self, df, mask):
+        """
+        Create findings for the rows selected by mask.
+
+        The templates are not formatted here; each finding keeps the row values
+        and is rendered when a report reads it.
+        """
+        findings = []
+        matches = df.loc[mask, self.required_columns]
+        columns = self.required_columns
+        for index, *values in zip(matches.index,
+                                  *(matches[col] for col in columns)):
+            row = dict(zip(columns, values))
+            if self.fields is not None:
+                row.update(self.fields(row))
+            findings.append(Finding(
+                self.rule_id,
+                index + 2,  # Excel rows start at 1; +2 accounts for header row
+                self.attribute, self.issue, self.severity,
+                object_id=row.get('Object ID'),
+                fields=row, value=self.value))
+        return findings
+
+
+class RuleRegistry:
+    """Registry of all declarative checks, evaluated in registration order."""
+
+    _rules = []
+    # Columns read by checks that are not CheckRules: (project, check_type, columns)
+    _column_declarations = []
+
+    @classmethod
+    def register(cls, rule):
+        if any(existing.rule_id == rule.rule_id for existing in cls._rules):
+            raise ValueError(f"Rule '{rule.rule_id}' is already registered")
+        cls._rules.append(rule)
+        return rule
+
+    @classmethod
+    def get(cls, rule_id):
+        for rule in cls._rules:
+            if rule.rule_id == rule_id:
+                return rule
+        raise KeyError(f"Unknown rule: {rule_id}")
+
+    @classmethod
+    def rules_for(cls, project, check_type):
+        """Return the active rules for a project and check direction."""
+        return [rule for rule in cls._rules
+                if rule.project == project and rule.check_type == check_type]
+
+    @classmethod
+    def declare_columns(cls, project, check_type, columns):
+        """Declare the sheet columns used by a check that is not a CheckRule."""
+        cls._column_declarations.append((project, check_type, list(columns)))
+
+    @classmethod
+    def columns_for(cls, project, check_type):
+        """
+        Return the union of the sheet columns used by all checks of a project
+        and check direction, in first-use order.
+        """
+        columns = []
+        for rule in cls.rules_for(project, check_type):
+            columns += rule.required_columns
+        for declared_project, declared_check_type, declared in cls._column_declarations:
+            if declared_project == project and declared_check_type == check_type:
+                columns += declared
+        return list(dict.fromkeys(columns))
+
+    @staticmethod
+    def evaluate(df, file_path, rules, expressions=None):
+        """
+        Evaluate a batch of rules against one sheet.
+
+        All predicates are computed first over a shared ColumnExpressions, then
+        findings are created only for the matching rows of each rule.
+
+        Args:
+            df (DataFrame): Sheet to check
+            file_path (str): Path of the sheet, used in warnings
+            rules (list): CheckRule instances to evaluate
+            expressions (ColumnExpressions, optional): Expressions of df to reuse
+
+        Returns:
+            list: Finding instances, in rule order
+        """
+        if expressions is None:
+            expressions = ColumnExpressions(df)
+        masks = []
+        for rule in rules:
+            missing_columns = rule.missing_columns(df)
+            if missing_columns:
+                print(
+                    f"Warning: Missing columns in the DataFrame: {missing_columns}, "
+                    f"in File: {file_path}.\nSkipping check: {rule.rule_id}")
+                continue
+            masks.append((rule, rule.predicate(expressions)))
+
+        findings = []
+        for rule, mask in masks:
+            if mask.any():
+                findings += rule.build_findings(df, mask)
+        return findings
@@ -1,7 +1,123 @@
 import os
 import pandas as pd
 
+from CheckRules import CheckRule, ColumnExpressions, RuleRegistry
+from CompareStore import CompareStore
+from Findings import Finding
 from HelperFunc import HelperFunctions
+from projconfig import CheckConfiguration
+from SimilarityMatcher import SimilarityMatcher
+
+PROJECT_PPE = CheckConfiguration.PROJECT["PPE_MLBW"]
+ANLAUFKONFIGURATION_COLUMNS = ['Anlaufkonfiguration_01',
+                               'Anlaufkonfiguration_02',
+                               'Anlaufkonfiguration_03']
+
+""" Import Check Rules """
+
+# Check Nr.1
+RuleRegistry.register(CheckRule(
+    rule_id='check_empty_object_id_with_forbidden_cr_status',
+    project=PROJECT_PPE,
+    check_type=CheckConfiguration.IMPORT_CHECK,
+    required_columns=['Object ID', 'CR-Status_Bosch_PPx'],
+    predicate=lambda expr: (
+            expr.isna('Object ID') &
+            expr.isin('CR-Status_Bosch_PPx', ['014,', '013,', '100,'])),
+    attribute='Object ID, CR-Status_Bosch_PPx',
+    issue="Empty 'Object ID' with forbidden 'CR-Status_Bosch_PPx' value",
+    value="Object ID: Empty, CR-Status_Bosch_PPx: {CR-Status_Bosch_PPx}"))
+
+# Check Nr.2
+RuleRegistry.register(CheckRule(
+    rule_id='check_cr_status_bosch_ppx_conditions',
+    project=PROJECT_PPE,
+    check_type=CheckConfiguration.IMPORT_CHECK,
+    required_columns=['CR-Status_Bosch_PPx', 'CR-ID_Bosch_PPx',
+                      'BRS-1Box_Status_Hersteller_Bosch_PPx'],
+    predicate=lambda expr: (
+            expr.eq('CR-Status_Bosch_PPx', "---") &
+            expr.notna('CR-ID_Bosch_PPx') &
+            expr.ne('BRS-1Box_Status_Hersteller_Bosch_PPx', "verworfen")),
+    attribute='CR-Status_Bosch_PPx, CR-ID_Bosch_PPx, BRS-1Box_Status_Hersteller_Bosch_PPx',
+    issue=("'CR-Status_Bosch_PPx' is '---' while 'CR-ID_Bosch_PPx' is not empty "
+           "and 'BRS-1Box_Status_Hersteller_Bosch_PPx' is not 'verworfen'"),
+    value=("CR-Status_Bosch_PPx: {CR-Status_Bosch_PPx}, "
+           "CR-ID_Bosch_PPx: {CR-ID_Bosch_PPx}, "
+           "BRS-1Box_Status_Hersteller_Bosch_PPx: {BRS-1Box_Status_Hersteller_Bosch_PPx}")))
+
+# Check Nr.3
+RuleRegistry.register(CheckRule(
+    rule_id='check_anlaufkonfiguration_empty',
+    project=PROJECT_PPE,
+    check_type=CheckConfiguration.IMPORT_CHECK,
+    required_columns=['Object ID'] + ANLAUFKONFIGURATION_COLUMNS,
+    predicate=lambda expr: expr.notna('Object ID') & (
+            expr.isna('Anlaufkonfiguration_01') |
+            expr.isna('Anlaufkonfiguration_02') |
+            expr.isna('Anlaufkonfiguration_03')),
+    attribute='{empty_columns}',
+    issue="{empty_columns} is empty while 'Object ID' is not empty.",
+    value="Object ID: {Object ID}, Empty Columns: {empty_columns}",
+    fields=lambda row: {'empty_columns': ', '.join(
+        col for col in ANLAUFKONFIGURATION_COLUMNS if pd.isna(row[col]))}))
+
+# Check Nr.4
+RuleRegistry.register(CheckRule(
+    rule_id='check_cr_id_empty_for_brs_hersteller_status',
+    project=PROJECT_PPE,
+    check_type=CheckConfiguration.IMPORT_CHECK,
+    required_columns=['CR-ID_Bosch_PPx',
+                      'BRS-1Box_Status_Hersteller_Bosch_PPx'],
+    predicate=lambda expr: expr.isna('CR-ID_Bosch_PPx'),
+    attribute='CR-ID_Bosch_PPx, BRS-1Box_Status_Hersteller_Bosch_PPx',
+    issue=("'CR-ID_Bosch_PPx' is empty while "
+           "'BRS-1Box_Status_Hersteller_Bosch_PPx' has a value."),
+    value=("CR-ID_Bosch_PPx: {CR-ID_Bosch_PPx}, "
+           "BRS-1Box_Status_Hersteller_Bosch_PPx: {BRS-1Box_Status_Hersteller_Bosch_PPx}")))
+
+""" Export Check Rules """
+
+# Check Nr.1
+RuleRegistry.register(CheckRule(
+    rule_id='check_cr_id_with_typ_and_brs_1box_status_zulieferer_bosch_ppx',
+    project=PROJECT_PPE,
+    check_type=CheckConfiguration.EXPORT_CHECK,
+    required_columns=['CR-ID_Bosch_PPx', 'Typ',
+                      'BRS-1Box_Status_Zulieferer_Bosch_PPx'],
+    predicate=lambda expr: (
+            expr.notna('CR-ID_Bosch_PPx') &
+            expr.eq('Typ', "Anforderung,") &
+            ~expr.isin('BRS-1Box_Status_Zulieferer_Bosch_PPx',
+                       ["akzeptiert", "abgelehnt"])),
+    attribute='CR-ID_Bosch_PPx, Typ, 1Box_Status_Zulieferer_Bosch_PPx',
+    issue=("'CR-ID_Bosch_PPx' is not empty and 'Typ' is 'Anforderung', "
+           "but 'BRS-1Box_Status_Zulieferer_Bosch_PPx' is not 'akzeptiert' or 'abgelehnt'"),
+    value=("CR-ID_Bosch_PPx: {CR-ID_Bosch_PPx}, "
+           "Typ: {typ}, BRS-1Box_Status_Zulieferer_Bosch_PPx: {BRS-1Box_Status_Zulieferer_Bosch_PPx}"),
+    fields=lambda row: {'typ': row['Typ'].rstrip(',')}))
+
+# Check Nr.2
+RuleRegistry.register(CheckRule(
+    rule_id='check_typ_with_brs_1box_status_zulieferer_bosch_ppx',
+    project=PROJECT_PPE,
+    check_type=CheckConfiguration.EXPORT_CHECK,
+    required_columns=['Typ', 'BRS-1Box_Status_Zulieferer_Bosch_PPx'],
+    predicate=lambda expr: (
+            expr.isin('Typ', ["Überschrift,", "Information,"]) &
+            (expr.lower('BRS-1Box_Status_Zulieferer_Bosch_PPx') != "n/a")),
+    attribute='Typ, BRS-1Box_Status_Zulieferer_Bosch_PPx',
+    issue=("'Typ' is 'Überschrift' or 'Information', "
+           "but 'BRS-1Box_Status_Zulieferer_Bosch_PPx' is not 'n/a'"),
+    value="Typ: {typ}, BRS-1Box_Status_Zulieferer_Bosch_PPx: {status}",
+    fields=lambda row: {
+        'typ': row['Typ'].rstrip(','),
+        'status': str(row['BRS-1Box_Status_Zulieferer_Bosch_PPx']).lower()}))
+
+# Columns of the compare file checks (Check Nr.6 and Nr.7 of the import checks)
+RuleRegistry.declare_columns(PROJECT_PPE, CheckConfiguration.IMPORT_CHECK,
+                             ['Object ID', 'Object Text',
+                              'BRS-1Box_Status_Hersteller_Bosch_PPx'])
 
 
 class ProjectCheckerPPE:
@@ -12,33 +128,11 @@ class ProjectCheckerPPE:
     def check_empty_object_id_with_forbidden_cr_status(df, file_path):
         """
         Checks if 'Object ID' is empty and 'CR-Status_Bosch_PPx' has forbidden values.
-        Returns findings as a list of dictionaries.
+        Returns findings as a list of Finding instances.
         """
-        findings = []
-        # Check for required columns
-        required_columns = ['Object ID', 'CR-Status_Bosch_PPx']
-        missing_columns = [col for col in required_columns if
-                           col not in df.columns]
-        if missing_columns:
-            check_name = __class__.check_empty_object_id_with_forbidden_cr_status.__name__
-            print(
-                f"Warning: Missing columns in the DataFrame: {missing_columns}, "
-                f"in File: {file_path}.\nSkipping check: {check_name}")
-            return findings
-
-        forbidden_status = ['014,', '013,', '100,']
-        for index, row in df.iterrows():
-            if pd.isna(row['Object ID']) and row[
-                'CR-Status_Bosch_PPx'] in forbidden_status:
-                object_id = "Empty"
-                findings.append({
-                    'Row': index + 2,
-                    # Excel rows start at 1; +2 accounts for header row
-                    'Attribute': 'Object ID, CR-Status_Bosch_PPx',
-                    'Issue': "Empty 'Object ID' with forbidden 'CR-Status_Bosch_PPx' value",
-                    'Value': f"Object ID: {object_id}, CR-Status_Bosch_PPx: {row['CR-Status_Bosch_PPx']}"
-                })
-        return findings
+        return ProjectCheckerPPE._run_rule(
+            __class__.check_empty_object_id_with_forbidden_cr_status.__name__,
+            df, file_path)
 
     # Check Nr.2
     @staticmethod
@@ -46,39 +140,11 @@ class ProjectCheckerPPE:
         """
         Checks if 'CR-Status_Bosch_PPx' is '---', 'CR-ID_Bosch_PPx' is not empty,
         and 'BRS-1Box_Status_Hersteller_Bosch_PPx' is not 'verworfen'.
-        Returns findings as a list of dictionaries.
+        Returns findings as a list of Finding instances.
         """
-        findings = []
-        # Check for required columns
-        required_columns = ['CR-Status_Bosch_PPx', 'CR-ID_Bosch_PPx',
-                            'BRS-1Box_Status_Hersteller_Bosch_PPx']
-        missing_columns = [col for col in required_columns if
-                           col not in df.columns]
-        if missing_columns:
-            check_name = __class__.check_cr_status_bosch_ppx_conditions.__name__
-            print(
-                f"Warning: Missing columns in the DataFrame: {missing_columns}, "
-                f"in File: {file_path}.\nSkipping check: {check_name}")
-            return findings
-
-        for index, row in df.iterrows():
-            if (row['CR-Status_Bosch_PPx'] == "---" and
-                    not pd.isna(row['CR-ID_Bosch_PPx']) and
-                    row[
-                        'BRS-1Box_Status_Hersteller_Bosch_PPx'] != "verworfen"):
-                findings.append({
-                    'Row': index + 2,
-                    # Adjust for Excel row (index + 2 to account for header row)
-                    'Attribute': 'CR-Status_Bosch_PPx, CR-ID_Bosch_PPx, BRS-1Box_Status_Hersteller_Bosch_PPx',
-                    'Issue': (
-                        "'CR-Status_Bosch_PPx' is '---' while 'CR-ID_Bosch_PPx' is not empty "
-                        "and 'BRS-1Box_Status_Hersteller_Bosch_PPx' is not 'verworfen'"),
-                    'Value': (
-                        f"CR-Status_Bosch_PPx: {row['CR-Status_Bosch_PPx']}, "
-                        f"CR-ID_Bosch_PPx: {row['CR-ID_Bosch_PPx']}, "
-                        f"BRS-1Box_Status_Hersteller_Bosch_PPx: {row['BRS-1Box_Status_Hersteller_Bosch_PPx']}")
-                })
-        return findings
+        return ProjectCheckerPPE._run_rule(
+            __class__.check_cr_status_bosch_ppx_conditions.__name__,
+            df, file_path)
 
     # Check Nr.3
     @staticmethod
@@ -86,39 +152,11 @@ class ProjectCheckerPPE:
         """
         Checks if 'Anlaufkonfiguration_01', 'Anlaufkonfiguration_02', 'Anlaufkonfiguration_03'
         are empty where 'Object ID' is not empty.
-        Returns findings as a list of dictionaries.
+        Returns findings as a list of Finding instances.
         """
-        findings = []
-        # Check for required columns
-        required_columns = ['Object ID', 'Anlaufkonfiguration_01',
-                            'Anlaufkonfiguration_02',
-                            'Anlaufkonfiguration_03']
-        missing_columns = [col for col in required_columns if
-                           col not in df.columns]
-        if missing_columns:
-            check_name = __class__.check_anlaufkonfiguration_empty.__name__
-            print(
-                f"Warning: Missing columns in the DataFrame: {missing_columns}, "
-                f"in File: {file_path}.\nSkipping check: {check_name}")
-            return findings
-
-        # Iterate through rows and check conditions
-        for index, row in df.iterrows():
-            if not pd.isna(
-                    row['Object ID']):  # Check if 'Object ID' is not empty
-                empty_columns = [col for col in required_columns[1:] if
-                                 pd.isna(row[col])]
-                if empty_columns:
-                    findings.append({
-                        'Row': index + 2,
-                        # Adjust for Excel row (index + 2 to account for header row)
-                        'Attribute': ', '.join(empty_columns),
-                        'Issue': (
-                            f"{', '.join(empty_columns)} is empty while 'Object ID' is not empty."),
-                        'Value': (f"Object ID: {row['Object ID']}, "
-                                  f"Empty Columns: {', '.join(empty_columns)}")
-                    })
-        return findings
+        return ProjectCheckerPPE._run_rule(
+            __class__.check_anlaufkonfiguration_empty.__name__,
+            df, file_path)
 
     # Check Nr.4
     @staticmethod
@@ -126,45 +164,31 @@ class ProjectCheckerPPE:
         """
         Checks if 'CR-ID_Bosch_PPx' is empty for any
         'BRS-1Box_Status_Hersteller_Bosch_PPx' status.
-        Returns findings as a list of dictionaries.
+        Returns findings as a list of Finding instances.
         """
-        findings = []
-        # Check for required columns
-        required_columns = ['CR-ID_Bosch_PPx',
-                            'BRS-1Box_Status_Hersteller_Bosch_PPx']
-        missing_columns = [col for col in required_columns if
-                           col not in df.columns]
-        if missing_columns:
-            check_name = __class__.check_cr_id_empty_for_brs_hersteller_status.__name__
-            print(
-                f"Warning: Missing columns in the DataFrame: {missing_columns}, "
-                f"in File: {file_path}.\nSkipping check: {check_name}")
-            return findings
-
-        # Iterate through rows and check conditions
-        for index, row in df.iterrows():
-            if pd.isna(row[
-                           'CR-ID_Bosch_PPx']):  # Check if 'CR-ID_Bosch_PPx' is empty
-                findings.append({
-                    'Row': index + 2,
-                    # Adjust for Excel row (index + 2 to account for header row)
-                    'Attribute': 'CR-ID_Bosch_PPx, BRS-1Box_Status_Hersteller_Bosch_PPx',
-                    'Issue': ("'CR-ID_Bosch_PPx' is empty while "
-                              "'BRS-1Box_Status_Hersteller_Bosch_PPx' has a value."),
-                    'Value': (f"CR-ID_Bosch_PPx: {row['CR-ID_Bosch_PPx']}, "
-                              f"BRS-1Box_Status_Hersteller_Bosch_PPx: {row['BRS-1Box_Status_Hersteller_Bosch_PPx']}")
-                })
-        return findings
+        return ProjectCheckerPPE._run_rule(
+            __class__.check_cr_id_empty_for_brs_hersteller_status.__name__,
+            df, file_path)
 
     # Check Nr.6
     @staticmethod
     def check_object_text_with_status_hersteller_bosch_ppx(df, compare_df,
-                                                           file_path, compare_file_path):
+                                                           file_path, compare_file_path,
+                                                           compare_store=None,
+                                                           expressions=None,
+                                                           similarity_threshold=None):
         """
         Compares the 'Object Text' attribute based on 'Object ID' with a compare file.
         If 'Object Text' differs, ensure 'BRS-1Box_Status_Hersteller_Bosch_PPx' is 'neu/geändert'.
         Optionally ignores spaces in the 'Object Text' for comparison.
         Logs findings if the condition is not met.
+        If a CompareStore of the compare file is given, its index is used instead
+        of building a lookup from compare_df. The fingerprints of 'Object Text'
+        are taken from expressions (the ColumnExpressions of df) if given.
+        If similarity_threshold is given, rows whose 'Object ID' is not in the
+        compare file are paired with the most similar 'Object Text' of the
+        compare rows whose 'Object ID' is not in df (see
+        match_similar_object_texts); each pair is reported.
         """
         findings = []
         # Ensure required columns exist in both DataFrames
@@ -188,15 +212,24 @@ class ProjectCheckerPPE:
                 f"Warning: Missing columns in the compare file: {missing_compare_columns}.\nSkipping check: {check_name}")
             return findings
 
-        # Create a dictionary for quick lookup of 'Object Text' from compare file
-        compare_dict = compare_df.set_index('Object ID')[
-            'Object Text'].to_dict()
+        # Lookup of 'Object Text' (and its fingerprint) from compare file
+        if compare_store is not None:
+            compare_dict = compare_store.lookup('Object ID')
+        else:
+            compare_dict = CompareStore.build_lookup(compare_df, 'Object ID')
+
+        # Both texts are fingerprinted in bulk beforehand, an unchanged text
+        # costs a single comparison
+        if expressions is None:
+            expressions = ColumnExpressions(df)
+        object_text_fingerprints = expressions.fingerprints('Object Text')
+        unmatched_rows = []  # Rows whose 'Object ID' is not in the compare file
 
         # Iterate through rows in the main DataFrame
-        for index, row in df.iterrows():
-            object_id = row['Object ID']
-            object_text = row['Object Text']
-            brs_status = row.get('BRS-1Box_Status_Hersteller_Bosch_PPx', None)
+        for index, object_id, object_text, brs_status, object_text_fingerprint in zip(
+                df.index, df['Object ID'], df['Object Text'],
+                df['BRS-1Box_Status_Hersteller_Bosch_PPx'],
+                object_text_fingerprints):
 
             # Skip rows with missing 'Object ID'
             if pd.isna(object_id):
@@ -204,58 +237,130 @@ class ProjectCheckerPPE:
 
             # Check if the 'Object ID' exists in the compare file
             if object_id in compare_dict:
-                compare_text = compare_dict[object_id]
-
-                # Normalize both object_text and compare_text
-                normalized_object_text = HelperFunctions.normalize_text(
-                    object_text)
-                normalized_compare_text = HelperFunctions.normalize_text(
-                    compare_text)
-                if normalized_object_text != normalized_compare_text:
+                compare_text, compare_text_fingerprint = compare_dict[object_id]
+
+                if object_text_fingerprint != compare_text_fingerprint:
                     if brs_status not in ['neu/geändert,']:
-                        findings.append({
-                            'Row': index + 2,  # Adjust for Excel row numbering
-                            'Attribute': 'Object Text, BRS-1Box_Status_Hersteller_Bosch_PPx',
-                            'Issue': (
-                                f"'Object Text' differs but 'BRS-1Box_Status_Hersteller_Bosch_PPx' is not 'neu/geändert'."
-                            ),
-                            'Value': (
-                                f"Object ID: {object_id}\n\n"
-                                f"---------------\n"
-                                f"       Customer File Name: {os.path.basename(file_path)}\n"
-                                f"       Customer File Object Text: {object_text}\n"
-                                f"---------------\n"
-                                f"       Bosch File Name: {os.path.basename(compare_file_path)}\n"
-                                f"       Bosch File Object Text: {compare_text}\n"
-                                f"---------------\n"
-                                f"       BRS-1Box_Status_Hersteller_Bosch_PPx: {brs_status}"
-                            )
-                        })
+                        findings.append(Finding(
+                            __class__.check_object_text_with_status_hersteller_bosch_ppx.__name__,
+                            index + 2,  # Adjust for Excel row numbering
+                            'Object Text, BRS-1Box_Status_Hersteller_Bosch_PPx',
+                            "'Object Text' differs but 'BRS-1Box_Status_Hersteller_Bosch_PPx' is not 'neu/geändert'.",
+                            object_id=object_id,
+                            customer_file=file_path,
+                            customer_text=object_text,
+                            bosch_file=compare_file_path,
+                            bosch_text=compare_text,
+                            details=(('BRS-1Box_Status_Hersteller_Bosch_PPx',
+                                      brs_status),)))
+            elif similarity_threshold is not None:
+                unmatched_rows.append(index)
+
+        if unmatched_rows:
+            findings += ProjectCheckerPPE.match_similar_object_texts(
+                df.loc[unmatched_rows], compare_df, file_path, compare_file_path,
+                ~compare_df['Object ID'].isin(df['Object ID'].dropna()).to_numpy(),
+                compare_store, similarity_threshold)
 
         return findings
 
+    @staticmethod
+    def match_similar_object_texts(unmatched_df, compare_df, file_path,
+                                   compare_file_path, allowed, compare_store=None,
+                                   similarity_threshold=0.8):
+        """
+        Part of Check Nr.6: pairs rows whose 'Object ID' is missing in the
+        compare file with their most likely counterpart, e.g. after the
+        customer re-imported a module and the IDs changed.
+        The 'Object Text' of each row is matched against the compare rows
+        marked in allowed with a SimilarityMatcher (MinHash/LSH, sub-quadratic),
+        the one of the CompareStore if given. Every pair whose texts reach
+        similarity_threshold is reported with its similarity.
+        """
+        if compare_store is not None:
+            matcher = compare_store.similarity_matcher()
+        else:
+            matcher = SimilarityMatcher(compare_df['Object Text'])
+
+        findings = []
+        for position, compare_position, similarity in matcher.match(
+                unmatched_df['Object Text'], similarity_threshold, allowed):
+            row = unmatched_df.iloc[position]
+            compare_row = compare_df.iloc[compare_position]
+            findings.append(Finding(
+                __class__.check_object_text_with_status_hersteller_bosch_ppx.__name__,
+                unmatched_df.index[position] + 2,  # Adjust for Excel row numbering
+                'Object ID, Object Text',
+                "'Object ID' not found in the compare file, but a requirement with "
+                "a similar 'Object Text' was found.",
+                object_id=row['Object ID'],
+                customer_file=file_path,
+                customer_text=row['Object Text'],
+                bosch_file=compare_file_path,
+                bosch_text=compare_row['Object Text'],
+                details=(('Compare Object ID', compare_row['Object ID']),
+                         ('Similarity', f"{similarity:.2f}"),
+                         ('BRS-1Box_Status_Hersteller_Bosch_PPx',
+                          row['BRS-1Box_Status_Hersteller_Bosch_PPx']))))
+        return findings
+
     # Check Nr.7
     @staticmethod
-    def check_object_text_with_rb_as_status(df, compare_df, file_path, compare_file_path):
+    def check_object_text_with_rb_as_status(df, compare_df, file_path, compare_file_path,
+                                            compare_store=None):
         """
         Compares 'Object Text' in the main file with the compare file based on 'Object ID'.
         If 'Object Text' differs, ensure 'RB_AS_Status' is not 'accepted', 'no_req', or 'canceled_closed'.
         Logs findings if the condition is not met.
+        If a CompareStore of the compare file is given, its text fingerprints are used.
+        To check several files, use collect_object_texts and
+        check_object_text_with_rb_as_status_all, which scan the compare file only once.
         """
-        findings = []
-        # Ensure required columns exist in both DataFrames
-        required_columns = ['Object ID', 'Object Text', 'RB_AS_Status']
-        missing_columns = [col for col in required_columns[:2] if
-                           col not in df.columns]
-        missing_compare_columns = [col for col in required_columns if
-                                   col not in compare_df.columns]
+        object_texts = ProjectCheckerPPE.collect_object_texts(df, file_path)
+        if object_texts is None:
+            return []
+        return ProjectCheckerPPE.check_object_text_with_rb_as_status_all(
+            {file_path: object_texts}, compare_df, compare_file_path,
+            compare_store)
 
+    @staticmethod
+    def collect_object_texts(df, file_path, expressions=None):
+        """
+        Collects the 'Object Text' and its fingerprint per 'Object ID' of a
+        main file for Check Nr.7.
+        Returns None (and logs a warning) if the required columns are missing.
+        """
+        missing_columns = [col for col in ['Object ID', 'Object Text'] if
+                           col not in df.columns]
         if missing_columns:
             check_name = __class__.check_object_text_with_rb_as_status.__name__
             print(
                 f"Warning: Missing columns in the DataFrame: {missing_columns}, "
                 f"in File: {file_path}.\nSkipping check: {check_name}")
-            return findings
+            return None
+
+        # Create a dictionary for quick lookup of 'Object Text' from main file(gernerated from reqif)
+        if expressions is None:
+            expressions = ColumnExpressions(df)
+        return dict(zip(df['Object ID'],
+                        zip(df['Object Text'],
+                            expressions.fingerprints('Object Text'))))
+
+    @staticmethod
+    def check_object_text_with_rb_as_status_all(object_texts_by_file, compare_df,
+                                                compare_file_path, compare_store=None):
+        """
+        Runs Check Nr.7 for all main files in a single pass over the compare file.
+        object_texts_by_file maps each main file path to the result of
+        collect_object_texts. The compare file rows are matched against the
+        combined 'Object ID' index of all files; each finding names the main
+        file it comes from.
+        """
+        findings = []
+        # Ensure required columns exist in the compare file
+        required_columns = ['Object ID', 'Object Text', 'RB_AS_Status']
+        missing_compare_columns = [col for col in required_columns if
+                                   col not in compare_df.columns]
 
         if missing_compare_columns:
             check_name = __class__.check_object_text_with_rb_as_status.__name__
@@ -263,16 +368,26 @@ class ProjectCheckerPPE:
                 f"Warning: Missing columns in the compare file: {missing_compare_columns}.\nSkipping check: {check_name}")
             return findings
 
-        # Create a dictionary for quick lookup of 'Object Text' from main file(gernerated from reqif)
-        compare_dict = df.set_index('Object ID')[
-            'Object Text'].to_dict()
+        # Combined index: 'Object ID' -> [(main file, 'Object Text', fingerprint)] in file order
+        combined_texts = {}
+        for file_path, object_texts in object_texts_by_file.items():
+            for object_id, (text, text_fingerprint) in object_texts.items():
+                combined_texts.setdefault(object_id, []).append(
+                    (file_path, text, text_fingerprint))
+
+        # Fingerprints of the 'Object Text' of the compare file rows
+        if compare_store is not None:
+            text_fingerprints = compare_store.text_fingerprints
+        else:
+            text_fingerprints = HelperFunctions.fingerprint_series(
+                compare_df['Object Text'])
 
         # Iterate through rows in the compare file DataFrame
-        for index, row in compare_df.iterrows():
-            object_id = row['Object ID']
+        for index, object_id, object_text, rb_as_status, object_text_fingerprint in zip(
+                compare_df.index, compare_df['Object ID'],
+                compare_df['Object Text'], compare_df['RB_AS_Status'],
+                text_fingerprints):
             # here object_text is from the compare CCB file
-            object_text = row['Object Text']
-            rb_as_status = row.get('RB_AS_Status', None)
             # Debugging
             if rb_as_status is None:
                 print(
@@ -282,43 +397,34 @@ class ProjectCheckerPPE:
             if pd.isna(object_id):
                 continue
 
-            # Check if the 'Object ID' exists in the compare file
-            if object_id in compare_dict:
+            # Check if the 'Object ID' exists in any main file
+            for file_path, compare_text, compare_text_fingerprint in combined_texts.get(
+                    object_id, ()):
                 # here the compare text is from generated reqif file
-                compare_text = compare_dict[object_id]
-                # Normalize both object_text and compare_text
-                normalized_object_text = HelperFunctions.normalize_text(
-                    object_text)
-                normalized_compare_text = HelperFunctions.normalize_text(
-                    compare_text)
 
                 # If 'Object Text' differs, check 'RB_AS_Status'
-                if normalized_object_text != normalized_compare_text:
+                if object_text_fingerprint != compare_text_fingerprint:
                     print(f"rb_as_status: {rb_as_status}")
                     if rb_as_status in ['accepted', 'no_req',
                                         'canceled_closed']:
-                        findings.append({
-                            'Row': index + 2,  # Adjust for Excel row numbering
-                            'Attribute': 'Object Text, RB_AS_Status',
-                            'Issue': (
-                                f"'Object Text' differs but 'RB_AS_Status' is one of the prohibited values "
-                                f"('accepted', 'no_req', 'canceled_closed')."
-                            ),
-                            'Value': (
-                                  f"Object ID: {object_id}\n"
-                                  f"---------------\n"
-                                  f"       Bosch File Name: { os.path.basename(compare_file_path)}\n"
-                                  f"       Bosch File Object Text: {object_text}\n"
-                                  f"---------------\n"
-                                  f"       Customer File Name: {os.path.basename(file_path)}\n"
-                                  f"       Customer File Object Text: {compare_text}\n"
-                                  f"---------------\n"
-                                  f"       RB_AS_Status: {rb_as_status}"
-                            )
-                        })
+                        # The row belongs to the compare file, its text is listed first
+                        findings.append(Finding(
+                            __class__.check_object_text_with_rb_as_status.__name__,
+                            index + 2,  # Adjust for Excel row numbering
+                            'Object Text, RB_AS_Status',
+                            "'Object Text' differs but 'RB_AS_Status' is one of the prohibited values "
+                            "('accepted', 'no_req', 'canceled_closed').",
+                            object_id=object_id,
+                            customer_file=file_path,
+                            customer_text=compare_text,
+                            bosch_file=compare_file_path,
+                            bosch_text=object_text,
+                            bosch_first=True,
+                            details=(('RB_AS_Status', rb_as_status),)))
 
         return findings
 
+
     """ Export Checks"""
 
     # Check Nr.1
@@ -328,64 +434,24 @@ class ProjectCheckerPPE:
         """
         Checks if 'CR-ID_Bosch_PPx' is not empty and 'Typ' is 'Anforderung',
         then 'BRS-1Box_Status_Zulieferer_Bosch_PPx' must be 'akzeptiert' or 'abgelehnt'.
-        Returns findings as a list of dictionaries.
+        Returns findings as a list of Finding instances.
         """
-        findings = []
-        # Check for required columns
-        required_columns = ['CR-ID_Bosch_PPx', 'Typ',
-                            'BRS-1Box_Status_Zulieferer_Bosch_PPx']
-        missing_columns = [col for col in required_columns if
-                           col not in df.columns]
-        if missing_columns:
-            print(
-                f"Warning: Missing columns in the DataFrame: {missing_columns},"
-                f" in File: {file_path}")
-            return findings
-
-        for index, row in df.iterrows():
-            if not pd.isna(row['CR-ID_Bosch_PPx']) and \
-                    row['Typ'] == "Anforderung,":
-                if row['BRS-1Box_Status_Zulieferer_Bosch_PPx'] \
-                        not in ["akzeptiert", "abgelehnt"]:
-                    findings.append({
-                        'Row': index + 2,
-                        'Attribute': 'CR-ID_Bosch_PPx, Typ, 1Box_Status_Zulieferer_Bosch_PPx',
-                        'Issue': (
-                            "'CR-ID_Bosch_PPx' is not empty and 'Typ' is 'Anforderung', "
-                            "but 'BRS-1Box_Status_Zulieferer_Bosch_PPx' is not 'akzeptiert' or 'abgelehnt'"),
-                        'Value': (
-                            f"CR-ID_Bosch_PPx: {row['CR-ID_Bosch_PPx']}, "
-                            f"Typ: {row['Typ'].rstrip(',')}, BRS-1Box_Status_Zulieferer_Bosch_PPx: {row['BRS-1Box_Status_Zulieferer_Bosch_PPx']}")
-                    })
-        return findings
+        return ProjectCheckerPPE._run_rule(
+            __class__.check_cr_id_with_typ_and_brs_1box_status_zulieferer_bosch_ppx.__name__,
+            df, file_path)
 
     # Check Nr.2
+    @staticmethod
     def check_typ_with_brs_1box_status_zulieferer_bosch_ppx(df, file_path):
         """
         Checks if 'Typ' is 'Überschrift' or 'Information', then 'BRS-1Box_Status_Zulieferer_Bosch_PPx' must be 'n/a'.
-        Returns findings as a list of dictionaries.
+        Returns findings as a list of Finding instances.
         """
-        findings = []
-        required_columns = ['Typ', 'BRS-1Box_Status_Zulieferer_Bosch_PPx']
-        missing_columns = [col for col in required_columns if
-                           col not in df.columns]
+        return ProjectCheckerPPE._run_rule(
+            __class__.check_typ_with_brs_1box_status_zulieferer_bosch_ppx.__name__,
+            df, file_path)
 
-        if missing_columns:
-            print(
-                f"Warning: Missing columns in the DataFrame: {missing_columns},"
-                f" in File: {file_path}")
-            return findings
-
-        for index, row in df.iterrows():
-            if row['Typ'] in ["Überschrift,", "Information,"]:
-                value = str(
-                    row['BRS-1Box_Status_Zulieferer_Bosch_PPx']).lower()
-                if value != "n/a":
-                    findings.append({
-                        'Row': index + 2,
-                        'Attribute': 'Typ, BRS-1Box_Status_Zulieferer_Bosch_PPx',
-                        'Issue': ("'Typ' is 'Überschrift' or 'Information', "
-                                  "but 'BRS-1Box_Status_Zulieferer_Bosch_PPx' is not 'n/a'"),
-                        'Value': f"Typ: {row['Typ'].rstrip(',')}, BRS-1Box_Status_Zulieferer_Bosch_PPx: {value}"
-                    })
-        return findings
+    @staticmethod
+    def _run_rule(rule_id, df, file_path):
+        """Evaluate a single registered rule against the DataFrame."""
+        return RuleRegistry.evaluate(df, file_path, [RuleRegistry.get(rule_id)])
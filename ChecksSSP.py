@@ -1,6 +1,16 @@
 import os
 import pandas as pd
+from CheckRules import ColumnExpressions, RuleRegistry
+from CompareStore import CompareStore
+from Findings import Finding
 from HelperFunc import HelperFunctions
+from projconfig import CheckConfiguration
+
+# Columns of the compare file check (Check Nr.6 of the import checks)
+RuleRegistry.declare_columns(CheckConfiguration.PROJECT["SSP"],
+                             CheckConfiguration.IMPORT_CHECK,
+                             ['ReqIF.Text', 'ReqIF.ForeignID', 'Object ID',
+                              'Status OEM zu Lieferant R'])
 
 
 class ProjectCheckerSSP:
@@ -9,12 +19,17 @@ class ProjectCheckerSSP:
     # Check Nr.6
     @staticmethod
     def check_object_text_with_status_oem_zu_lieferant_r(df, compare_df,
-                                                           file_path, compare_file_path):
+                                                           file_path, compare_file_path,
+                                                           compare_store=None,
+                                                           expressions=None):
         """
         Compares the 'ReqIF.Text' attribute with 'Object Text' attribute from a compare file.
         If 'Object Text' differs from 'ReqIF.Text', ensure 'Status OEM zu Lieferant R' is 'zu bewerten'.
         Handles cases where the identifier is either 'ReqIF.ForeignID' or 'Object ID'.
         Logs findings if the condition is not met.
+        If a CompareStore of the compare file is given, its index is used instead
+        of building a lookup from compare_df. The fingerprints of 'ReqIF.Text'
+        are taken from expressions (the ColumnExpressions of df) if given.
         """
         findings = []
         # Determine the identifier column dynamically
@@ -53,15 +68,23 @@ class ProjectCheckerSSP:
                 f"Warning: Missing columns in the compare file: {missing_compare_columns}.\nSkipping check: {check_name}")
             return findings
 
-        # Create a dictionary for quick lookup of 'Object Text' from compare file
-        compare_dict = compare_df.set_index(compare_identifier_col)[
-            'Object Text'].to_dict()
+        # Lookup of 'Object Text' (and its fingerprint) from compare file
+        if compare_store is not None:
+            compare_dict = compare_store.lookup(compare_identifier_col)
+        else:
+            compare_dict = CompareStore.build_lookup(compare_df,
+                                                     compare_identifier_col)
+
+        # Both texts are fingerprinted in bulk beforehand
+        if expressions is None:
+            expressions = ColumnExpressions(df)
+        object_text_fingerprints = expressions.fingerprints('ReqIF.Text',
+                                                            stringify=True)
 
         # Iterate through rows in the main DataFrame
-        for index, row in df.iterrows():
-            object_id = row[identifier_col]
-            object_text = row['ReqIF.Text']
-            oem_status = row.get('Status OEM zu Lieferant R', None)
+        for index, object_id, object_text, oem_status, object_text_fingerprint in zip(
+                df.index, df[identifier_col], df['ReqIF.Text'],
+                df['Status OEM zu Lieferant R'], object_text_fingerprints):
             if pd.isna(oem_status):
                 oem_status = "Empty"
 
@@ -71,7 +94,7 @@ class ProjectCheckerSSP:
 
             # Check if the 'Object ID' exists in the compare file
             if object_id in compare_dict:
-                compare_text = compare_dict[object_id]
+                compare_text, compare_text_fingerprint = compare_dict[object_id]
 
                 # Convert to string and strip whitespace
                 object_text_str = str(object_text) if not pd.isna(
@@ -85,30 +108,23 @@ class ProjectCheckerSSP:
                 if not object_text_str and not compare_text_str:
                     continue
 
-                # Normalize both object_text and compare_text
-                normalized_object_text = HelperFunctions.normalize_text(
-                    object_text_str)
-                normalized_compare_text = HelperFunctions.normalize_text(
-                    compare_text_str)
-                if normalized_object_text != normalized_compare_text:
+                if not isinstance(compare_text, str):
+                    # The store fingerprints only strings, numbers are compared as text
+                    compare_text_fingerprint = HelperFunctions.text_fingerprint(
+                        compare_text_str)
+                if object_text_fingerprint != compare_text_fingerprint:
                     if oem_status not in ['zu bewerten,']:
-                        findings.append({
-                            'Row': index + 2,  # Adjust for Excel row numbering
-                            'Attribute': 'ReqIF.Text, Status OEM zu Lieferant R',
-                            'Issue': (
-                                f"'ReqIF.Text' differs from 'Object Text' but 'Status OEM zu Lieferant R' is not 'zu bewerten'."
-                            ),
-                            'Value': (
-                                f"{identifier_col}: {object_id}\n\n"
-                                f"---------------\n"
-                                f"       Customer File Name: {os.path.basename(file_path)}\n"
-                                f"       Customer File Object Text: {object_text_str}\n"
-                                f"---------------\n"
-                                f"       Bosch File Name: {os.path.basename(compare_file_path)}\n"
-                                f"       Bosch File Object Text: {compare_text_str}\n"
-                                f"---------------\n"
-                                f"       Status OEM zu Lieferant R: {oem_status}"
-                            )
-                        })
+                        findings.append(Finding(
+                            __class__.check_object_text_with_status_oem_zu_lieferant_r.__name__,
+                            index + 2,  # Adjust for Excel row numbering
+                            'ReqIF.Text, Status OEM zu Lieferant R',
+                            "'ReqIF.Text' differs from 'Object Text' but 'Status OEM zu Lieferant R' is not 'zu bewerten'.",
+                            object_id=object_id,
+                            id_column=identifier_col,
+                            customer_file=file_path,
+                            customer_text=object_text_str,
+                            bosch_file=compare_file_path,
+                            bosch_text=compare_text_str,
+                            details=(('Status OEM zu Lieferant R', oem_status),)))
 
         return findings
\ No newline at end of file
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import pickle
+import uuid
+
+import pandas as pd
+
+from HelperFunc import HelperFunctions
+from SimilarityMatcher import SimilarityMatcher
+
+# Identifier columns of a compare file that get an index
+ID_COLUMNS = ['Object ID', 'ForeignID']
+# Text column of a compare file that is indexed and pre-fingerprinted
+TEXT_COLUMN = 'Object Text'
+
+
+class CompareStore:
+    """
+    Indexed, persistent form of a compare file (e.g. CCB_Tracking_PPE.xlsx).
+
+    The compare file is read once and indexed by 'Object ID' and 'ForeignID'.
+    Each index maps an identifier to its 'Object Text' and the fingerprint of
+    the text (HelperFunctions.text_fingerprint), so the checks detect an
+    unchanged text with a single comparison. Duplicate identifiers keep the
+    last row, like set_index(...).to_dict(). The store is pickled to the cache
+    folder. It is rebuilt when the size or modification time of the compare
+    file changes and its content hash differs. The similarity index of the
+    texts is only built on demand (see similarity_matcher).
+    """
+
+    # Bump when the stored layout changes, so older stores are rebuilt
+    STORE_VERSION = 3
+
+    def __init__(self, compare_file, df):
+        """
+        Args:
+            compare_file (str): Path to the compare file
+            df (DataFrame): Content of the compare file
+        """
+        self.compare_file = compare_file
+        self.df = df
+        self.text_fingerprints = None  # Fingerprint of 'Object Text' per row of df
+        self.indexes = {}  # id column -> {id: (text, text fingerprint)}
+        if TEXT_COLUMN in df.columns:
+            self.text_fingerprints = HelperFunctions.fingerprint_series(
+                df[TEXT_COLUMN])
+            for id_column in ID_COLUMNS:
+                if id_column in df.columns:
+                    self.indexes[id_column] = dict(zip(
+                        df[id_column],
+                        zip(df[TEXT_COLUMN], self.text_fingerprints)))
+        self.file_state = None  # (version, size, mtime, hash) of compare_file
+        self._similarity_matcher = None
+
+    def lookup(self, id_column):
+        """Return the {id: (text, text fingerprint)} index of an identifier column."""
+        return self.indexes[id_column]
+
+    def similarity_matcher(self):
+        """
+        Return the SimilarityMatcher of the 'Object Text' column, built on
+        first use and shared by all files checked against the store. Worker
+        processes only share it if it was built before the store was handed
+        to them (see ChecksProcessorExcel._process_all).
+        """
+        if self._similarity_matcher is None:
+            self._similarity_matcher = SimilarityMatcher(self.df[TEXT_COLUMN])
+        return self._similarity_matcher
+
+    @staticmethod
+    def build_lookup(df, id_column, text_column=TEXT_COLUMN):
+        """
+        Build an {id: (text, text fingerprint)} lookup directly from a DataFrame.
+
+        Used by the checks when no store is available.
+        """
+        texts = df[text_column]
+        return dict(zip(df[id_column],
+                        zip(texts, HelperFunctions.fingerprint_series(texts))))
+
+    @classmethod
+    def load(cls, compare_file, cache_folder):
+        """
+        Return the store of a compare file, from the cache folder if still valid.
+
+        Args:
+            compare_file (str): Path to the compare file
+            cache_folder (str): Folder holding persisted stores
+
+        Returns:
+            CompareStore: The store of the compare file
+        """
+        store_path = os.path.join(cache_folder, cls._store_name(compare_file))
+        stat = os.stat(compare_file)
+
+        store = cls._read_store(store_path)
+        if store is not None:
+            version, size, mtime, file_hash = store.file_state
+            if version == cls.STORE_VERSION and size == stat.st_size:
+                if mtime == stat.st_mtime_ns:
+                    return store
+                # Modified time changed (e.g. copied file), compare the content
+                if file_hash == HelperFunctions.file_hash(compare_file):
+                    store.file_state = (version, size, stat.st_mtime_ns,
+                                        file_hash)
+                    cls._write_store(store, store_path)
+                    return store
+
+        df = pd.read_excel(compare_file, keep_default_na=False, na_values=[''])
+        store = cls(compare_file, df)
+        store.file_state = (cls.STORE_VERSION, stat.st_size, stat.st_mtime_ns,
+                            HelperFunctions.file_hash(compare_file))
+        cls._write_store(store, store_path)
+        return store
+
+    @staticmethod
+    def _store_name(compare_file):
+        path_hash = hashlib.sha256(
+            os.path.abspath(compare_file).encode('utf-8')).hexdigest()
+        return f"{os.path.splitext(os.path.basename(compare_file))[0]}_{path_hash[:16]}.pkl"
+
+    @staticmethod
+    def _read_store(store_path):
+        if not os.path.exists(store_path):
+            return None
+        try:
+            with open(store_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"Error reading compare store '{store_path}': {e}")
+            return None
+
+    @staticmethod
+    def _write_store(store, store_path):
+        """Persist the store atomically; errors only cost the next run a rebuild."""
+        temp_path = f"{store_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(store_path), exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, store_path)
+        except Exception as e:
+            print(f"Error writing compare store '{store_path}': {e}")
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
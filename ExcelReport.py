@@ -0,0 +1,153 @@
+import math
+import os
+import re
+from collections import Counter
+
+import xlsxwriter
+
+# Columns of the per-check sheets
+CHECK_COLUMNS = ['Row', 'Object ID', 'Attribute', 'Issue', 'Severity',
+                 'Customer File', 'Customer Text', 'Bosch File', 'Bosch Text',
+                 'Details']
+CHECK_COLUMN_WIDTHS = [8, 18, 30, 50, 10, 25, 60, 25, 60, 50]
+
+SUMMARY_SHEET = "Summary"
+MAX_SHEET_NAME_LENGTH = 31
+_INVALID_SHEET_CHARACTERS = re.compile(r"[\[\]:*?/\\]")
+
+
+class ExcelReport:
+    """
+    Excel report with a summary sheet and one sheet per check.
+
+    The workbook is written with xlsxwriter in constant memory mode: each row
+    is flushed to disk as soon as the next one is started, so memory does not
+    grow with the number of findings. The summary sheet comes first and lists
+    the number of findings per check with a link to its sheet. All sheets
+    have a frozen header row and an autofilter.
+    """
+
+    @staticmethod
+    def generate(file_path, report_folder, findings):
+        """
+        Write the report of a file.
+
+        Args:
+            file_path (str): Path to the input Excel file
+            report_folder (str): Directory where the report should be saved
+            findings (list): Finding instances to report
+
+        Returns:
+            str: Path to the generated report file
+        """
+        file_name = os.path.basename(file_path)
+        report_file = os.path.join(report_folder,
+                                   f"{file_name.replace('.xlsx', '')}_report.xlsx")
+
+        counts = Counter(finding.rule_id for finding in findings)
+        sheet_names = ExcelReport.sheet_names(counts)
+
+        workbook = xlsxwriter.Workbook(report_file, {'constant_memory': True})
+        try:
+            header_format = workbook.add_format({'bold': True, 'bg_color': '#DDEBF7',
+                                                 'border': 1})
+            # The summary is written last, when all check sheets exist, but
+            # it is the first sheet of the workbook
+            summary = workbook.add_worksheet(SUMMARY_SHEET)
+
+            sheets = {}
+            next_rows = {}
+            for rule_id, sheet_name in sheet_names.items():
+                sheet = workbook.add_worksheet(sheet_name)
+                for column, (title, width) in enumerate(
+                        zip(CHECK_COLUMNS, CHECK_COLUMN_WIDTHS)):
+                    sheet.set_column(column, column, width)
+                    sheet.write_string(0, column, title, header_format)
+                sheet.freeze_panes(1, 0)
+                sheet.autofilter(0, 0, counts[rule_id], len(CHECK_COLUMNS) - 1)
+                sheets[rule_id] = sheet
+                next_rows[rule_id] = 1
+
+            for finding in findings:
+                sheet = sheets[finding.rule_id]
+                row = next_rows[finding.rule_id]
+                next_rows[finding.rule_id] = row + 1
+                ExcelReport._write_finding(sheet, row, finding)
+
+            ExcelReport._write_summary(summary, header_format, file_name,
+                                       len(findings), counts, sheet_names)
+        finally:
+            workbook.close()
+
+        return report_file
+
+    @staticmethod
+    def sheet_names(counts):
+        """
+        Return a valid, unique worksheet name per check.
+
+        Excel limits names to 31 characters and forbids []:*?/\\; names are
+        compared case-insensitively.
+        """
+        used = {SUMMARY_SHEET.lower()}
+        names = {}
+        for rule_id in counts:
+            base = _INVALID_SHEET_CHARACTERS.sub('_', str(rule_id)).strip("'") or "Check"
+            name = base[:MAX_SHEET_NAME_LENGTH]
+            number = 2
+            while name.lower() in used:
+                suffix = f"_{number}"
+                name = base[:MAX_SHEET_NAME_LENGTH - len(suffix)] + suffix
+                number += 1
+            used.add(name.lower())
+            names[rule_id] = name
+        return names
+
+    @staticmethod
+    def _write_finding(sheet, row, finding):
+        sheet.write_number(row, 0, finding.row)
+        sheet.write_string(row, 1, ExcelReport._cell_text(finding.object_id))
+        sheet.write_string(row, 2, finding.attribute)
+        sheet.write_string(row, 3, finding.issue)
+        sheet.write_string(row, 4, finding.severity or "")
+        if finding.has_texts():
+            sheet.write_string(row, 5, os.path.basename(finding.customer_file))
+            sheet.write_string(row, 6, ExcelReport._text(finding.customer_text))
+            sheet.write_string(row, 7, os.path.basename(finding.bosch_file))
+            sheet.write_string(row, 8, ExcelReport._text(finding.bosch_text))
+            sheet.write_string(row, 9, "\n".join(
+                f"{label}: {value}" for label, value in finding.details))
+        else:
+            sheet.write_string(row, 9, finding.render_value())
+
+    @staticmethod
+    def _write_summary(summary, header_format, file_name, total, counts,
+                       sheet_names):
+        summary.set_column(0, 0, 55)
+        summary.set_column(1, 2, 20)
+        summary.write_string(0, 0, "Check", header_format)
+        summary.write_string(0, 1, "Sheet", header_format)
+        summary.write_string(0, 2, "Findings", header_format)
+        summary.freeze_panes(1, 0)
+        row = 0
+        for row, (rule_id, count) in enumerate(counts.most_common(), start=1):
+            summary.write_string(row, 0, str(rule_id))
+            summary.write_url(row, 1, f"internal:'{sheet_names[rule_id]}'!A1",
+                              string=sheet_names[rule_id])
+            summary.write_number(row, 2, count)
+        summary.autofilter(0, 0, max(row, 1), 2)
+        summary.write_string(row + 2, 0, "File")
+        summary.write_string(row + 2, 1, file_name)
+        summary.write_string(row + 3, 0, "Total Findings")
+        summary.write_number(row + 3, 1, total)
+
+    @staticmethod
+    def _text(value):
+        # Missing values read 'nan', as in the other report types
+        return value if isinstance(value, str) else f"{value}"
+
+    @staticmethod
+    def _cell_text(value):
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return ""
+        return ExcelReport._text(value)
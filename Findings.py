@@ -0,0 +1,155 @@
+import os
+
+# Keys of the dictionary form of a finding, in report column order
+FINDING_KEYS = ('Row', 'Attribute', 'Issue', 'Value', 'Severity')
+
+_SEPARATOR = "---------------"
+
+
+class Finding:
+    """
+    A single check finding with typed fields.
+
+    Checks only store the raw values of a finding; the multi-line 'Value'
+    text is rendered when a report asks for it. There are two kinds of
+    findings:
+
+    - Findings of a CheckRule keep the row values in fields; attribute, issue
+      and value are the templates of the rule, formatted on access.
+    - Findings of the text comparison checks keep the identifier, both file
+      names and both texts, so that reports can diff the texts directly.
+
+    For code written against the former dictionaries, a finding also supports
+    finding['Row'], 'Severity' in finding, keys(), items() and to_dict().
+    """
+
+    __slots__ = ('rule_id', 'row', 'object_id', 'id_column', 'severity',
+                 'customer_file', 'customer_text', 'bosch_file', 'bosch_text',
+                 'bosch_first', 'details', 'fields',
+                 '_attribute', '_issue', '_value')
+
+    def __init__(self, rule_id, row, attribute, issue, severity=None,
+                 object_id=None, id_column='Object ID',
+                 customer_file=None, customer_text=None,
+                 bosch_file=None, bosch_text=None, bosch_first=False,
+                 details=(), fields=None, value=None):
+        """
+        Args:
+            rule_id (str): Name of the check that produced the finding
+            row (int): Excel row of the finding (DataFrame index + 2)
+            attribute (str): Attributes involved, or a template if fields is given
+            issue (str): Issue description, or a template if fields is given
+            severity (str, optional): Severity, None for checks without one
+            object_id (optional): Identifier of the requirement
+            id_column (str, optional): Name of the identifier column
+            customer_file (str, optional): Path of the customer file
+            customer_text (optional): Text of the customer file
+            bosch_file (str, optional): Path of the Bosch (compare) file
+            bosch_text (optional): Text of the Bosch file
+            bosch_first (bool, optional): Whether the Bosch text is listed first,
+                i.e. the row belongs to the Bosch file
+            details (tuple, optional): Further (label, value) pairs, e.g. a status
+            fields (dict, optional): Row values the templates are formatted with
+            value (str, optional): Template of the 'Value' text (with fields)
+        """
+        self.rule_id = rule_id
+        self.row = row
+        self.object_id = object_id
+        self.id_column = id_column
+        self.severity = severity
+        self.customer_file = customer_file
+        self.customer_text = customer_text
+        self.bosch_file = bosch_file
+        self.bosch_text = bosch_text
+        self.bosch_first = bosch_first
+        self.details = details
+        self.fields = fields
+        self._attribute = attribute
+        self._issue = issue
+        self._value = value
+
+    @property
+    def attribute(self):
+        if self.fields is None:
+            return self._attribute
+        return self._attribute.format_map(self.fields)
+
+    @property
+    def issue(self):
+        if self.fields is None:
+            return self._issue
+        return self._issue.format_map(self.fields)
+
+    def has_texts(self):
+        """Whether the finding compares a customer text with a Bosch text."""
+        return self.customer_file is not None or self.bosch_file is not None
+
+    def render_value(self, customer_text=None, bosch_text=None):
+        """
+        Render the multi-line 'Value' text of the finding.
+
+        Args:
+            customer_text (str, optional): Replaces the customer text, e.g. by
+                its highlighted HTML form
+            bosch_text (str, optional): Replaces the Bosch text
+
+        Returns:
+            str: The rendered text
+        """
+        if not self.has_texts():
+            if self._value is None:
+                return ""
+            if self.fields is None:
+                return self._value
+            return self._value.format_map(self.fields)
+
+        if customer_text is None:
+            customer_text = self.customer_text
+        if bosch_text is None:
+            bosch_text = self.bosch_text
+        sections = [
+            ("Customer", self.customer_file, customer_text),
+            ("Bosch", self.bosch_file, bosch_text),
+        ]
+        if self.bosch_first:
+            sections.reverse()
+
+        lines = [f"{self.id_column}: {self.object_id}\n"]
+        for label, file_path, text in sections:
+            lines.append(_SEPARATOR)
+            lines.append(f"       {label} File Name: {os.path.basename(file_path)}")
+            lines.append(f"       {label} File Object Text: {text}")
+        lines.append(_SEPARATOR)
+        lines += [f"       {label}: {value}" for label, value in self.details]
+        return "\n".join(lines)
+
+    def to_dict(self):
+        """Return the finding as a dictionary with the keys of FINDING_KEYS."""
+        return dict(self.items())
+
+    def keys(self):
+        return [key for key in FINDING_KEYS if key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __contains__(self, key):
+        if key == 'Severity':
+            return self.severity is not None
+        return key in FINDING_KEYS
+
+    def __getitem__(self, key):
+        if key == 'Row':
+            return self.row
+        if key == 'Attribute':
+            return self.attribute
+        if key == 'Issue':
+            return self.issue
+        if key == 'Value':
+            return self.render_value()
+        if key == 'Severity' and self.severity is not None:
+            return self.severity
+        raise KeyError(key)
+
+    def __repr__(self):
+        return f"Finding({self.rule_id!r}, row={self.row!r}, object_id={self.object_id!r})"
@@ -1,5 +1,33 @@
+import hashlib
+import math
 import re
 
+import numpy as np
+import pandas as pd
+
+# Translation table deleting what normalize_text removes: whitespace (every
+# character matched by \s, i.e. str.isspace(), all of which lie below U+3001),
+# semicolons and quotes
+_NORMALIZE_TABLE = {code: None for code in range(0x3001)
+                    if chr(code).isspace()}
+_NORMALIZE_TABLE.update({ord(';'): None, ord("'"): None, ord('"'): None})
+
+# Normalized texts by text, shared by all sheets and compare files of a run;
+# requirement texts mostly repeat between files and baselines
+_normalized_cache = {}
+NORMALIZED_CACHE_SIZE = 500_000
+# Fingerprints by normalized text, shared the same way
+_fingerprint_cache = {}
+# Categories per enum column, shared by all sheets so that the categorical
+# columns of every file use the same dictionary
+_enum_categories = {}
+
+# Key of the parsed requirements (ReqIFStreamParser) holding their fingerprint
+FINGERPRINT_COLUMN = 'ReqIF.Fingerprint'
+# Attributes left out of requirement fingerprints: identifiers are what
+# requirements are matched by, not part of their content
+FINGERPRINT_EXCLUDED = ('reqifId', 'ReqIF.ForeignID', FINGERPRINT_COLUMN)
+
 
 class HelperFunctions:
 
@@ -20,3 +48,152 @@ class HelperFunctions:
             text = re.sub(r'[\s;\'"]', '', text)
 
         return text.strip()
+
+    @staticmethod
+    def normalize_series(series, stringify=False):
+        """
+        Normalize a whole column like normalize_text, in bulk.
+
+        Each distinct value is normalized only once (with a translate table
+        instead of a regex) and looked up in a cache shared across files.
+
+        :param series: The column to normalize.
+        :param stringify: Whether values that are neither strings nor missing
+            (e.g. numbers) are normalized as str(value) instead of becoming "".
+        :return: Series of normalized texts with the index of series.
+        """
+        codes, uniques = pd.factorize(series)
+        if len(_normalized_cache) > NORMALIZED_CACHE_SIZE:
+            _normalized_cache.clear()
+
+        normalized = []
+        for value in uniques:
+            if not isinstance(value, str):
+                if not stringify:
+                    normalized.append("")
+                    continue
+                value = str(value)
+            result = _normalized_cache.get(value)
+            if result is None:
+                result = _normalized_cache[value] = value.translate(
+                    _NORMALIZE_TABLE)
+            normalized.append(result)
+
+        # Missing values have code -1 and pick the trailing ""
+        normalized.append("")
+        return pd.Series(np.array(normalized, dtype=object)[codes],
+                         index=series.index, dtype=object)
+
+    @staticmethod
+    def text_fingerprint(text):
+        """
+        Return the fingerprint of a text: a 16 byte digest of the text
+        normalized like normalize_text. Texts that are equal after
+        normalization have equal fingerprints.
+
+        :param text: The text to fingerprint (values that are not strings count as "").
+        :return: The fingerprint (bytes).
+        """
+        if not isinstance(text, str):
+            return HelperFunctions._digest("")
+        return HelperFunctions._digest(text.translate(_NORMALIZE_TABLE))
+
+    @staticmethod
+    def fingerprint_series(series, stringify=False):
+        """
+        Fingerprint a whole column like text_fingerprint, in bulk.
+
+        Comparing two fingerprints takes constant time, whatever the length
+        of the texts.
+
+        :param series: The column to fingerprint.
+        :param stringify: See normalize_series.
+        :return: Series of fingerprints (bytes) with the index of series.
+        """
+        codes, uniques = pd.factorize(
+            HelperFunctions.normalize_series(series, stringify))
+        if len(_fingerprint_cache) > NORMALIZED_CACHE_SIZE:
+            _fingerprint_cache.clear()
+        digests = np.array([HelperFunctions._digest(value) for value in uniques]
+                           + [HelperFunctions._digest("")], dtype=object)
+        return pd.Series(digests[codes], index=series.index, dtype=object)
+
+    @staticmethod
+    def _digest(normalized):
+        result = _fingerprint_cache.get(normalized)
+        if result is None:
+            result = _fingerprint_cache[normalized] = hashlib.blake2b(
+                normalized.encode('utf-8'), digest_size=16).digest()
+        return result
+
+    @staticmethod
+    def requirement_fingerprint(values, excluded=FINGERPRINT_EXCLUDED):
+        """
+        Return the fingerprint of a requirement: a hex digest over its
+        attribute values normalized like normalize_text.
+
+        The fingerprint does not depend on the attribute order; empty and
+        missing values are left out, so absent and empty attributes give the
+        same fingerprint.
+
+        :param values: Attribute name -> value of the requirement.
+        :param excluded: Attributes that are not part of the fingerprint.
+        :return: The fingerprint (32 hex characters).
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for name in sorted(values):
+            if name in excluded:
+                continue
+            value = values[name]
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                continue
+            normalized = str(value).translate(_NORMALIZE_TABLE)
+            if normalized:
+                digest.update(f"{name}\x1e{normalized}\x1f".encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def to_categorical(df, columns):
+        """
+        Convert enum columns (status values, 'Typ', ...) to categoricals.
+
+        The categories of each column are shared across sheets and grow with
+        every new value, so all sheets use the same codes. A column of a few
+        dozen distinct values then takes one byte per row instead of an object
+        reference plus a string, and comparisons such as isin() run on the
+        integer codes. Values read back unchanged, missing values stay NaN.
+
+        :param df: The sheet; it is not modified.
+        :param columns: Names of the enum columns, columns missing in df are skipped.
+        :return: The sheet with the enum columns as categoricals.
+        """
+        df = df.copy(deep=False)
+        for column in columns:
+            if column not in df.columns or isinstance(df[column].dtype,
+                                                      pd.CategoricalDtype):
+                continue
+            values = pd.Index(df[column].dropna().unique())
+            categories = _enum_categories.get(column)
+            if categories is None:
+                categories = values
+            else:
+                new_values = values[~values.isin(categories)]
+                if len(new_values):
+                    categories = categories.append(new_values)
+            _enum_categories[column] = categories
+            df[column] = df[column].astype(pd.CategoricalDtype(categories))
+        return df
+
+    @staticmethod
+    def file_hash(file_path):
+        """
+        Return the SHA-256 hex digest of a file's content, read in chunks of 1 MiB.
+
+        :param file_path: Path to the file.
+        :return: The hex digest (str).
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
@@ -1,16 +1,37 @@
 import os
 import pandas as pd
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from CheckRules import ColumnExpressions, RuleRegistry
+from CompareStore import CompareStore
+from HelperFunc import HelperFunctions
 from ReportGenerator import ReportGenerator
+from SheetCache import SheetCache
 from ChecksPPE import ProjectCheckerPPE
 from ChecksSSP import  ProjectCheckerSSP
 from projconfig import CheckConfiguration
 
 
+# Processor instance installed once per worker process by _init_worker
+_worker_processor = None
+
+
+def _init_worker(processor):
+    """Install the processor (including the loaded compare file) in a worker process."""
+    global _worker_processor
+    _worker_processor = processor
+
+
+def _run_in_worker(method_name, item):
+    return getattr(_worker_processor, method_name)(item)
+
+
 class ChecksProcessorExcel:
     """Main processor for Excel file Checks."""
 
-    def __init__(self, project_type, check_type, excel_folder, compare_file=None, report_type="HTML"):
+    def __init__(self, project_type, check_type, excel_folder, compare_file=None, report_type="HTML",
+                 workers=1):
         self.project = project_type
         self.check_type = check_type
         self.report_folder = CheckConfiguration.REPORT_FOLDER
@@ -18,99 +39,200 @@ class ChecksProcessorExcel:
         self.folder_path = excel_folder
         self.compare_file = compare_file
         self.compare_df = None  # Dataframe to hold compare file data
+        self.compare_store = None  # Indexed compare file, shared by all files of the run
+        self.workers = max(1, workers or 1)  # Number of worker processes
+        # Only the columns used by the checks are read from the Excel files
+        self.columns = list(dict.fromkeys(
+            RuleRegistry.columns_for(self.project, self.check_type) +
+            CheckConfiguration.IDENTIFIER_COLUMNS))
+        self.sheet_cache = None
+        if CheckConfiguration.SHEET_CACHE_ENABLED:
+            self.sheet_cache = SheetCache(CheckConfiguration.SHEET_CACHE_FOLDER,
+                                          CheckConfiguration.SHEET_CACHE_MAX_BYTES,
+                                          CheckConfiguration.CONVERTER_VERSION)
 
-        # if compare_file is provided, read it into a DataFrame
+        # if compare_file is provided, load its indexed store (read from the
+        # compare file only if the persisted store is outdated)
         if self.compare_file:
             try:
-                self.compare_df = pd.read_excel(self.compare_file,
-                                                keep_default_na=False,
-                                                na_values=[''])
+                self.compare_store = CompareStore.load(
+                    self.compare_file, CheckConfiguration.COMPARE_CACHE_FOLDER)
+                self.compare_df = self.compare_store.df
 
                 print(
                     f"Compare file '{self.compare_file}' loaded successfully.")
             except Exception as e:
                 print(f"Error loading compare file '{self.compare_file}': {e}")
                 self.compare_df = None
+                self.compare_store = None
 
     def process_folder(self):
         """Process all Excel files in the specified folder."""
+        file_paths = [os.path.join(self.folder_path, file_name)
+                      for file_name in sorted(os.listdir(self.folder_path))
+                      if file_name.endswith('.xlsx')]
+        return self._process_all('_process_file', file_paths, file_paths)
+
+    def process_dataframes(self, frames):
+        """
+        Process sheets that were converted in memory, without reading Excel files.
+
+        Args:
+            frames (dict): DataFrame per path of the Excel file it stands for;
+                           the path is only used for report names and messages
+
+        Returns:
+            list: Paths to the generated reports
+        """
+        items = sorted(frames.items())
+        return self._process_all('_process_frame', items,
+                                 [file_path for file_path, _ in items])
+
+    def _process_all(self, method_name, items, file_paths):
+        """Run a per-sheet processing method on all items and write the reports."""
         # Delete existing report folder
         self._delete_folder(self.report_folder)
         os.makedirs(self.report_folder, exist_ok=True)
 
+        if self.workers > 1 and len(items) > 1:
+            # The compare file is loaded once here and handed to each worker
+            # by the initializer; map() returns results in submission order.
+            # The similarity index is built before, so the workers share it
+            # instead of each building its own
+            if (CheckConfiguration.SIMILARITY_MATCHING and self.compare_store is not None
+                    and self.project == CheckConfiguration.PROJECT["PPE_MLBW"]
+                    and self.check_type == CheckConfiguration.IMPORT_CHECK):
+                self.compare_store.similarity_matcher()
+            with ProcessPoolExecutor(max_workers=self.workers,
+                                     initializer=_init_worker,
+                                     initargs=(self,)) as executor:
+                results = list(executor.map(_run_in_worker,
+                                            repeat(method_name), items))
+        else:
+            results = [getattr(self, method_name)(item) for item in items]
+
         reports = []
-        for file_name in os.listdir(self.folder_path):
-            if file_name.endswith('.xlsx'):
-                file_path = os.path.join(self.folder_path, file_name)
-                report = self._process_file(file_path)
-                reports.append(report)
+        object_texts_by_file = {}
+        for file_path, (report, object_texts) in zip(file_paths, results):
+            reports.append(report)
+            if object_texts is not None:
+                object_texts_by_file[file_path] = object_texts
+
+        # check_object_text_with_rb_as_status runs once for the whole folder:
+        # the compare file is scanned a single time against the Object IDs of
+        # all files, the merged report is named after the compare file. Like
+        # the per-file check before, the report is written whenever files were
+        # checked against a compare file, even if none of them contributed
+        if (items and self.compare_df is not None
+                and self.project == CheckConfiguration.PROJECT["PPE_MLBW"]
+                and self.check_type == CheckConfiguration.IMPORT_CHECK):
+            rb_as_status_findings = ProjectCheckerPPE.check_object_text_with_rb_as_status_all(
+                object_texts_by_file, self.compare_df, self.compare_file,
+                self.compare_store)
+            ReportGenerator.generate_report(
+                self.compare_file,
+                self.report_folder,
+                self.report_type,
+                rb_as_status_findings
+            )
 
         return reports
 
     def _process_file(self, file_path):
         """Process a single Excel file."""
+        df = self._load_sheet(file_path)
+        return self._process_dataframe(df, file_path)
+
+    def _load_sheet(self, file_path):
+        """
+        Read a sheet from the sheet cache if it is valid, else from the Excel file.
+        The enum columns are converted to categoricals (see _categorize).
+        """
         # Read Excel file with special handling of missing values:
         #   - keep_default_na=False: Preserves strings like 'n/a', 'N/A', 'NA' as actual strings instead of converting them to NaN
         #   - na_values=['']: Only treats completely empty cells as missing values (NaN)
         # Read Excel file: preserve 'n/a' as string (keep_default_na=False) and only treat empty cells as NaN (na_values=[''])
-        df = pd.read_excel(file_path, keep_default_na=False, na_values=[''])
-        findings = []
+        # usecols: skip all columns no check reads (e.g. large rich-text columns)
+        columns = set(self.columns)
+
+        def read_excel():
+            return pd.read_excel(file_path, keep_default_na=False, na_values=[''],
+                                 usecols=lambda column: column in columns)
+
+        if self.sheet_cache is None:
+            return self._categorize(read_excel())
+        # The column selection is part of the cache key
+        return self._categorize(self.sheet_cache.load(
+            file_path, read_excel, variant="\0".join(sorted(columns))))
+
+    @staticmethod
+    def _categorize(df):
+        """
+        Convert the enum columns of a sheet to categoricals with categories
+        shared by all sheets of the run. Cached sheets keep the plain columns.
+        """
+        return HelperFunctions.to_categorical(df, CheckConfiguration.CATEGORICAL_COLUMNS)
+
+    def _process_frame(self, item):
+        """Process a (file path, DataFrame) pair converted in memory."""
+        file_path, df = item
+        return self._process_dataframe(self._categorize(df), file_path)
+
+    def _process_dataframe(self, df, file_path):
+        """
+        Run the checks on a single sheet.
+
+        Returns:
+            tuple: Path to the generated report and the 'Object Text' per
+                   'Object ID' for check_object_text_with_rb_as_status
+                   (None if the check does not apply)
+        """
+
+        # Derived columns (masks, normalized texts) computed once per sheet
+        # and shared by all checks
+        expressions = ColumnExpressions(df)
+
+        # Evaluate all registered single-sheet rules for the project and
+        # check type in one batch
+        findings = RuleRegistry.evaluate(
+            df, file_path,
+            RuleRegistry.rules_for(self.project, self.check_type),
+            expressions)
+        object_texts = None
 
         # Select Project
         if self.project == CheckConfiguration.PROJECT["PPE_MLBW"]:
             # Select checks based on type
             # Import check AUDI ==> BOSCH
             if self.check_type == CheckConfiguration.IMPORT_CHECK:
-                findings = (
-                        ProjectCheckerPPE.check_empty_object_id_with_forbidden_cr_status(
-                            df, file_path) +
-                        ProjectCheckerPPE.check_cr_status_bosch_ppx_conditions(
-                            df, file_path) +
-                        ProjectCheckerPPE.check_anlaufkonfiguration_empty(
-                            df, file_path) +
-                        ProjectCheckerPPE.check_cr_id_empty_for_brs_hersteller_status(
-                            df, file_path)
-                )
                 if self.compare_df is not None:
 
                     findings += ProjectCheckerPPE.check_object_text_with_status_hersteller_bosch_ppx(
-                        df, self.compare_df, file_path, self.compare_file)
+                        df, self.compare_df, file_path, self.compare_file,
+                        self.compare_store, expressions,
+                        CheckConfiguration.SIMILARITY_THRESHOLD
+                        if CheckConfiguration.SIMILARITY_MATCHING else None)
 
-                    # Execute check check_object_text_with_rb_as_status and create a separate report
-                    rb_as_status_findings = ProjectCheckerPPE.check_object_text_with_rb_as_status(
-                        df, self.compare_df, file_path, self.compare_file)
+                    # Collect the input of check_object_text_with_rb_as_status, the
+                    # check and its separate report run once per folder in _process_all
+                    object_texts = ProjectCheckerPPE.collect_object_texts(
+                        df, file_path, expressions)
 
-                    # if rb_as_status_findings:
-                        # Generate a separate report for this check
-                    ReportGenerator.generate_report(
-                        self.compare_file,
-                        self.report_folder,
-                        self.report_type,
-                        rb_as_status_findings
-                    )
-
-            else:
-                # Export check BOSCH ==> AUDI
-                findings = (
-                        ProjectCheckerPPE.check_cr_id_with_typ_and_brs_1box_status_zulieferer_bosch_ppx(
-                            df, file_path)
-                        +
-                        ProjectCheckerPPE.check_typ_with_brs_1box_status_zulieferer_bosch_ppx(
-                            df, file_path)
-                )
         elif self.project == CheckConfiguration.PROJECT["SSP"]:
             if self.check_type == CheckConfiguration.IMPORT_CHECK:
                 # Here implement check 1 - 5
                 if self.compare_df is not None:
                     findings += ProjectCheckerSSP.check_object_text_with_status_oem_zu_lieferant_r(
-                        df, self.compare_df, file_path, self.compare_file)
+                        df, self.compare_df, file_path, self.compare_file,
+                        self.compare_store, expressions)
             else:
                 # Export check BOSCH ==> AUDI
                 print("[SSP] NO EXPORT CHECKS DEFINED SOFAR")
 
         # Generate report
-        return ReportGenerator.generate_report(file_path, self.report_folder, self.report_type,
-                                               findings)
+        report = ReportGenerator.generate_report(file_path, self.report_folder, self.report_type,
+                                                 findings)
+        return report, object_texts
 
     def _delete_folder(self, folder_path):
         """Delete a folder and its contents."""
@@ -1,7 +1,10 @@
 from ReqIF2ExelConverter import ReqIF2ExcelProcessor
 from ImportExportChecksExcel import ChecksProcessorExcel, CheckConfiguration
 from reqif_utils import ReqIFProcessor
+from ReqIFCompare import ReqIFComparator
+from ReportGenerator import ReportGenerator
 from tkinter import filedialog, ttk, messagebox, PhotoImage
+import multiprocessing
 import os
 import tkinter as tk
 from tkinter import ttk
@@ -173,9 +176,22 @@ class ImportExportGui:
                                                 command=self.execute_reqif_checks,
                                                 style='TButton')
 
+        # Convert in memory and check without the Excel round trip
+        self.convert_check_button = ttk.Button(self.button_frame,
+                                               text="Convert && Check",
+                                               command=self.convert_and_check,
+                                               style='TButton')
+        self.write_excel_var = tk.BooleanVar(value=False)
+        self.write_excel_checkbox = ttk.Checkbutton(self.button_frame,
+                                                    text="Export Excel",
+                                                    variable=self.write_excel_var,
+                                                    style='NoFocus.TCheckbutton')
+
         # Default view: Show Convert and Execute Checks buttons
         self.convert_button.pack(side=tk.LEFT, padx=20)
         self.execute_button.pack(side=tk.LEFT, padx=20)
+        self.convert_check_button.pack(side=tk.LEFT, padx=20)
+        self.write_excel_checkbox.pack(side=tk.LEFT)
 
         # Report Type Selection Frame
         self.report_type_frame = ttk.Frame(master)
@@ -202,6 +218,27 @@ class ImportExportGui:
                         style='TRadiobutton').grid(row=0, column=2, padx=10,
                                                    sticky="w")
 
+        # Paged HTML Report Radio Button (for files with many findings)
+        ttk.Radiobutton(self.report_type_frame, text="HTML (paged)",
+                        variable=self.report_type_var,
+                        value="HTML_Paged",
+                        style='TRadiobutton').grid(row=0, column=3, padx=10,
+                                                   sticky="w")
+
+        # Virtualized HTML Report Radio Button (single file, rendered on scroll)
+        ttk.Radiobutton(self.report_type_frame, text="HTML (virtual)",
+                        variable=self.report_type_var,
+                        value="HTML_Virtual",
+                        style='TRadiobutton').grid(row=0, column=4, padx=10,
+                                                   sticky="w")
+
+        # Excel Report with one sheet per check, written in constant memory
+        ttk.Radiobutton(self.report_type_frame, text="Excel (per check)",
+                        variable=self.report_type_var,
+                        value="Excel_Sheets",
+                        style='TRadiobutton').grid(row=0, column=5, padx=10,
+                                                   sticky="w")
+
         # Status bar
         self.status_bar = ttk.Label(master, text="", relief=tk.SUNKEN,
                                     anchor=tk.W, font=("Helvetica", 10))
@@ -331,6 +368,8 @@ class ImportExportGui:
             self.execute_reqif_button.pack_forget()
             self.convert_button.pack(side=tk.LEFT, padx=20)
             self.execute_button.pack(side=tk.LEFT, padx=20)
+            self.convert_check_button.pack(side=tk.LEFT, padx=20)
+            self.write_excel_checkbox.pack(side=tk.LEFT)
         else:
             for widget in self.path_frame.winfo_children():
                 widget.destroy()
@@ -344,6 +383,8 @@ class ImportExportGui:
             # Hide Convert and Execute Checks buttons and show the single Execute button
             self.convert_button.pack_forget()
             self.execute_button.pack_forget()
+            self.convert_check_button.pack_forget()
+            self.write_excel_checkbox.pack_forget()
             self.execute_reqif_button.pack(side=tk.LEFT, padx=20)
 
     def operation_type(self):
@@ -380,7 +421,10 @@ class ImportExportGui:
             source_folder=reqif_folder,
             reqif_folder=unzip_folder,
             excel_folder=excel_folder,
-            check_type=check_type
+            check_type=check_type,
+            incremental=CheckConfiguration.INCREMENTAL_CONVERSION,
+            in_memory=CheckConfiguration.IN_MEMORY_ARCHIVES,
+            workers=CheckConfiguration.CONVERSION_WORKERS
         )
         processor.process()
 
@@ -413,11 +457,39 @@ class ImportExportGui:
         print(f"Path of the refernce file is:  '{reference_file}'")
 
         processor = ChecksProcessorExcel(project_type, check_type, self.excel_path_var.get(),
-                                         reference_file, report_type)
+                                         reference_file, report_type,
+                                         workers=CheckConfiguration.CHECK_WORKERS)
         reports = processor.process_folder()
         self.update_status_bar(
             f"Processed {len(reports)} files. Check reports in {CheckConfiguration.REPORT_FOLDER}")
 
+    def convert_and_check(self):
+        """Convert the ReqIF files in memory and run the checks on the DataFrames."""
+        check_type = self.operation_type()
+        self.update_status_bar(f"Performing {check_type} Conversion and Checks...")
+        self.master.update()  # Updates the Tkinter GUI before continuing
+
+        converter = ReqIF2ExcelProcessor(
+            source_folder=self.reqif_path_var.get(),
+            reqif_folder=self.unzip_path_var.get(),
+            excel_folder=self.excel_path_var.get(),
+            check_type=check_type,
+            in_memory=CheckConfiguration.IN_MEMORY_ARCHIVES
+        )
+        frames = converter.process_to_dataframes(
+            write_excel=self.write_excel_var.get())
+
+        reference_file = self.ref_path_var.get() if self.ref_path_var.get() != "---- Optional ----" else None
+        processor = ChecksProcessorExcel(self.project_var.get(),
+                                         self.check_type_var.get(),
+                                         self.excel_path_var.get(),
+                                         reference_file,
+                                         self.report_type_var.get(),
+                                         workers=CheckConfiguration.CHECK_WORKERS)
+        reports = processor.process_dataframes(frames)
+        self.update_status_bar(
+            f"Processed {len(reports)} files. Check reports in {CheckConfiguration.REPORT_FOLDER}")
+
     def execute_reqif_checks(self):
         """Execute checks for ReqIF Conversion."""
         customer_reqif_path = self.cus_reqif_path_var.get()
@@ -434,42 +506,66 @@ class ImportExportGui:
 
         # Create an instance of ReqIFProcessor
         reqif_processor = ReqIFProcessor()
+        customer_reqif_file = own_reqif_file = None
 
         try:
-            # Extract .reqifz files (if necessary) and get paths to .reqif files
-            customer_reqif_file, own_reqif_file = reqif_processor.extract_reqifz_files(
+            # Open the .reqif documents, reading .reqifz archives in memory
+            customer_reqif_file, own_reqif_file = reqif_processor.open_reqif_files(
                 customer_reqif_path, own_reqif_path
             )
-            print(f"Customer ReqIF file: {customer_reqif_file}")
-            print(f"Own ReqIF file: {own_reqif_file}")
+            print(f"Customer ReqIF file: {customer_reqif_file.name}")
+            print(f"Own ReqIF file: {own_reqif_file.name}")
 
             # Perform the comparison of the .reqif files
             self.update_status_bar("Comparing ReqIF files...")
-            self.compare_reqif_files(customer_reqif_file, own_reqif_file)
+            summary = self.compare_reqif_files(customer_reqif_file, own_reqif_file)
 
         except Exception as e:
             self.update_status_bar(f"Error during ReqIF checks: {str(e)}")
+            return
         finally:
-            # Clean up temporary directories
-            print("Deletion to be perfomed here")
-            reqif_processor.cleanup_temp_dirs()
+            for reqif_file in (customer_reqif_file, own_reqif_file):
+                if reqif_file is not None:
+                    reqif_file.close()
 
-        self.update_status_bar("ReqIF checks completed successfully.")
+        self.update_status_bar(
+            f"ReqIF checks completed: {summary['changed']} changed, "
+            f"{summary['added']} added, {summary['removed']} removed requirements, "
+            f"{summary['moved']} moved, {summary['reparented']} re-parented, "
+            f"{summary['reordered']} reordered in the hierarchy. "
+            f"Check the report in {CheckConfiguration.REPORT_FOLDER}")
 
     def compare_reqif_files(self, customer_reqif_file, own_reqif_file):
         """
-        Compare the two .reqif files.
-        Add your specific comparison logic here.
-        """
-        # Example: Print the paths of the files being compared
-        print(f"Comparing Customer ReqIF: {customer_reqif_file}")
-        print(f"Comparing Own ReqIF: {own_reqif_file}")
+        Compare the two .reqif files and write a report of the differences.
 
-        # Add your comparison logic here
-        # For example, parse the .reqif files and compare their contents
-        # ...
+        Requirements are matched by identifier and foreign ID (see
+        ReqIFCompare); added, removed and changed requirements are reported
+        per attribute in the selected report type, together with the moved,
+        re-parented and reordered nodes of the SPEC-HIERARCHY.
 
-        # ... (rest of the class remains the same)
+        Args:
+            customer_reqif_file (file): Binary stream of the customer .reqif document
+            own_reqif_file (file): Binary stream of the own .reqif document
+        """
+        print(f"Comparing Customer ReqIF: {customer_reqif_file.name}")
+        print(f"Comparing Own ReqIF: {own_reqif_file.name}")
+
+        comparison = ReqIFComparator.compare(
+            customer_reqif_file, own_reqif_file,
+            CheckConfiguration.REQIF_COMPARE_IGNORED_ATTRIBUTES)
+        summary = comparison.summary()
+        print(f"ReqIF comparison: {summary}")
+
+        report_name = (
+            f"{os.path.splitext(comparison.customer.name)[0]}_vs_"
+            f"{os.path.splitext(comparison.own.name)[0]}")
+        os.makedirs(CheckConfiguration.REPORT_FOLDER, exist_ok=True)
+        report = ReportGenerator.generate_report(
+            report_name, CheckConfiguration.REPORT_FOLDER,
+            self.report_type_var.get(), comparison.findings())
+        print(f"ReqIF comparison report: {report}")
+        return summary
 
     def update_status_bar(self, message):
         self.status_bar.config(text=message)
@@ -485,4 +581,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for worker processes in the frozen (PyInstaller) executable
+    multiprocessing.freeze_support()
     main()
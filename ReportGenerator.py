@@ -1,13 +1,23 @@
+from collections import Counter
 from datetime import datetime
+import html
+import math
 import os
 from typing import Dict, Any, List
-import difflib
 import pandas as pd
 
+from ExcelReport import ExcelReport
+from TextDiff import TextDiffer
+from VirtualReport import VirtualReport
+from projconfig import CheckConfiguration
+
 
 class ReportGenerator:
     """Generates reports from validation findings."""
 
+    # TextDiffer of the process, created from the configuration on first use
+    _text_differ = None
+
     @staticmethod
     def generate_report_old(file_path, report_folder, findings):
         """Generate a structured and flexible text report for findings."""
@@ -111,6 +121,24 @@ class ReportGenerator:
                        background: #2d2d2d;
                        border-radius: 5px;
                    }
+                   .nav {
+                       margin: 15px 0;
+                       font-size: 14px;
+                   }
+                   .nav a {
+                       margin-right: 15px;
+                       color: #003366;
+                   }
+                   table.summary {
+                       border-collapse: collapse;
+                       margin-bottom: 20px;
+                       font-size: 14px;
+                   }
+                   table.summary th, table.summary td {
+                       border: 1px solid #ccc;
+                       padding: 5px 10px;
+                       text-align: left;
+                   }
                """
 
     @staticmethod
@@ -118,6 +146,7 @@ class ReportGenerator:
         """
         Highlight the differences between two texts using HTML spans.
         If one text is missing, the other text is fully highlighted.
+        The diff mode, cost cap and cache are configured in CheckConfiguration.
         """
 
         # Ensure we remove any hidden whitespace or special formatting
@@ -133,28 +162,31 @@ class ReportGenerator:
         if text2 and not text1:
             return '<span class="diff-del">Empty</span>', f'<span class="diff-add">{text2}</span>'
 
-        matcher = difflib.SequenceMatcher(None, text1, text2)
-        result1, result2 = [], []
-
-        for op, i1, i2, j1, j2 in matcher.get_opcodes():
-            if op == 'equal':
-                result1.append(text1[i1:i2])
-                result2.append(text2[j1:j2])
-            elif op == 'replace':
-                result1.append(f'<span class="diff-del">{text1[i1:i2]}</span>')
-                result2.append(f'<span class="diff-add">{text2[j1:j2]}</span>')
-            elif op == 'insert':
-                result2.append(f'<span class="diff-add">{text2[j1:j2]}</span>')
-            elif op == 'delete':
-                result1.append(f'<span class="diff-del">{text1[i1:i2]}</span>')
+        return ReportGenerator.text_differ().highlight(text1, text2)
 
-        return ''.join(result1), ''.join(result2)
 
 
+    @staticmethod
+    def text_differ():
+        """Return the TextDiffer configured in CheckConfiguration."""
+        if ReportGenerator._text_differ is None:
+            ReportGenerator._text_differ = TextDiffer(
+                CheckConfiguration.DIFF_MODE,
+                CheckConfiguration.DIFF_MAX_COST,
+                CheckConfiguration.DIFF_CACHE_FILE,
+                CheckConfiguration.DIFF_CACHE_MAX_ENTRIES)
+        return ReportGenerator._text_differ
 
     @staticmethod
     def generate_html_content(file_name, total_issues, issues_content):
         """Generate the complete HTML content."""
+        return (ReportGenerator.generate_html_header(file_name, total_issues) +
+                issues_content +
+                ReportGenerator.generate_html_footer())
+
+    @staticmethod
+    def generate_html_header(file_name, total_issues):
+        """Generate the HTML content that precedes the issues."""
         # Truncate the file name if it's too long
         max_filename_length = 50
         truncated_filename = file_name[:max_filename_length] + "..." if len(
@@ -173,7 +205,12 @@ class ReportGenerator:
             <div class="container">
                 <h2>📋 Report for the File: {truncated_filename}</h2>
                 <p><strong>Total Findings:</strong> {total_issues}</p>
-        {issues_content}
+        """
+
+    @staticmethod
+    def generate_html_footer():
+        """Generate the HTML content that follows the issues."""
+        return f"""
                 <div class="footer">
                     Generated by Import/Export Checker | Date: {datetime.now().strftime('%Y-%m-%d')}
                 </div>
@@ -181,62 +218,70 @@ class ReportGenerator:
         </body>
         </html>"""
 
+    @staticmethod
+    def iter_html_report(file_name, findings):
+        """
+        Generate the HTML report piece by piece: the header, one block per
+        issue and the footer.
+
+        Only one issue is formatted at a time, so writing the pieces to a file
+        needs memory for a single issue regardless of the number of findings.
+
+        Args:
+            file_name (str): Name of the checked file shown in the report
+            findings (list): Finding instances to report
+
+        Yields:
+            str: The next piece of the HTML document
+        """
+        yield ReportGenerator.generate_html_header(file_name, len(findings))
+        for index, finding in enumerate(findings):
+            if index:
+                yield "\n"
+            yield ReportGenerator.format_issue(finding)
+        yield ReportGenerator.generate_html_footer()
+
     @staticmethod
     def format_issue(finding):
-        """Format a single issue for the report."""
-        # Extract customer and Bosch texts from the Value string
-        value_lines = finding['Value'].split('\n')
-        customer_text = ""
-        bosch_text = ""
-
-        for i, line in enumerate(value_lines):
-            if "Customer File Object Text:" in line:
-                customer_text = line.replace("Customer File Object Text:",
-                                             "").strip()
-            elif "Bosch File Object Text:" in line:
-                bosch_text = line.replace("Bosch File Object Text:",
-                                          "").strip()
-
-        # Convert None values to empty strings (if needed)
-        customer_text = customer_text if customer_text else ""
-        bosch_text = bosch_text if bosch_text else ""
-
-        # Debugging output
-        # print(f"DEBUG - format_issue called for Row: {finding['Row']}")
-        # print(f"DEBUG - Customer Text: {repr(customer_text)}")
-        # print(f"DEBUG - Bosch Text: {repr(bosch_text)}")
-
-        # Ensure highlight_differences is always called
-        highlighted_customer, highlighted_bosch = ReportGenerator.highlight_differences(
-            customer_text, bosch_text)
-
-        # Replace the original texts in value_lines with highlighted versions
-        for i, line in enumerate(value_lines):
-            if "Customer File Object Text:" in line:
-                value_lines[
-                    i] = f"       Customer File Object Text: {highlighted_customer}"
-            elif "Bosch File Object Text:" in line:
-                value_lines[
-                    i] = f"       Bosch File Object Text: {highlighted_bosch}"
-
-        formatted_value = "<br>".join(value_lines)
+        """Format a single issue (a Finding) for the report."""
+        if finding.has_texts():
+            # Highlight the differences between the customer and Bosch texts
+            highlighted_customer, highlighted_bosch = ReportGenerator.highlight_differences(
+                ReportGenerator._text_of(finding.customer_text),
+                ReportGenerator._text_of(finding.bosch_text))
+            value = finding.render_value(highlighted_customer,
+                                         highlighted_bosch)
+        else:
+            value = finding.render_value()
+
+        formatted_value = value.replace('\n', '<br>')
+
+        # Severity is only present for findings of registered rules
+        severity_line = (
+            f"                       <p><strong>Severity:</strong> {finding.severity}</p>\n"
+            if finding.severity is not None else "")
 
         return f"""        <div class="issue">
-                       <h2>⚠️ Row: {finding['Row']}</h2>
-                       <p><strong>Attributes:</strong> {finding['Attribute']}</p>
-                       <p><strong>Check:</strong> {finding['Issue']}</p>
-                       <p><strong>Details:</strong></p>
+                       <h2>⚠️ Row: {finding.row}</h2>
+                       <p><strong>Attributes:</strong> {finding.attribute}</p>
+                       <p><strong>Check:</strong> {finding.issue}</p>
+{severity_line}                       <p><strong>Details:</strong></p>
                        <div class="code-block">{formatted_value}</div>
                    </div>"""
 
+    @staticmethod
+    def _text_of(text):
+        """Text of a finding as shown in the report (missing values as 'nan')."""
+        return text if isinstance(text, str) else f"{text}"
+
     @staticmethod
     def generate_excel_report(file_path, report_folder, findings):
         """Generate an Excel report for findings."""
         report_file = os.path.join(report_folder,
                                    f"{os.path.basename(file_path).replace('.xlsx', '')}_report.xlsx")
 
-        # Convert findings into a DataFrame
-        df = pd.DataFrame(findings)
+        # Convert findings into a DataFrame, the Value texts are rendered here
+        df = pd.DataFrame([finding.to_dict() for finding in findings])
 
         # Rename the Value column to Details
         df = df.rename(columns={'Value': 'Details'})
@@ -246,6 +291,133 @@ class ReportGenerator:
 
         return report_file
 
+    @staticmethod
+    def generate_paged_html_report(file_path, report_folder, findings,
+                                   page_size=None):
+        """
+        Generate an HTML report split into pages of a fixed number of findings.
+
+        The pages are written to the folder '<name>_report_pages' next to the
+        index page '<name>_report.html', which lists the number of findings
+        per check and per attribute and links to the pages. Each page links to
+        the index and to its neighbouring pages.
+
+        Args:
+            file_path (str): Path to the input Excel file
+            report_folder (str): Directory where the report should be saved
+            findings (list): Finding instances to report
+            page_size (int, optional): Findings per page. Defaults to
+                CheckConfiguration.REPORT_PAGE_SIZE.
+
+        Returns:
+            str: Path to the index page
+        """
+        page_size = page_size or CheckConfiguration.REPORT_PAGE_SIZE
+        file_name = os.path.basename(file_path)
+        base_name = file_name.replace('.xlsx', '')
+        report_file = os.path.join(report_folder, f"{base_name}_report.html")
+        pages_folder_name = f"{base_name}_report_pages"
+        pages_folder = os.path.join(report_folder, pages_folder_name)
+        os.makedirs(pages_folder, exist_ok=True)
+
+        page_count = math.ceil(len(findings) / page_size)
+        index_link = f"../{base_name}_report.html"
+        check_counts, check_pages = Counter(), {}
+        attribute_counts, attribute_pages = Counter(), {}
+        pages = []  # (first row, last row, number of findings) per page
+
+        def page_link(page_number):
+            return f"{pages_folder_name}/{ReportGenerator._page_name(page_number)}"
+
+        for page_number in range(1, page_count + 1):
+            page_findings = findings[(page_number - 1) * page_size:page_number * page_size]
+            for finding in page_findings:
+                check_counts[finding.rule_id] += 1
+                check_pages.setdefault(finding.rule_id, page_number)
+                for attribute in finding.attribute.split(', '):
+                    attribute_counts[attribute] += 1
+                    attribute_pages.setdefault(attribute, page_number)
+
+            page_file = os.path.join(pages_folder,
+                                     ReportGenerator._page_name(page_number))
+            with open(page_file, 'w', encoding='utf-8') as f:
+                for chunk in ReportGenerator.iter_html_page(
+                        file_name, page_findings, page_number, page_count,
+                        len(findings), index_link):
+                    f.write(chunk)
+            pages.append((page_findings[0].row, page_findings[-1].row,
+                          len(page_findings)))
+
+        def count_table(title, label, counts, first_pages):
+            rows = "".join(
+                f"<tr><td>{html.escape(str(name))}</td><td>{count}</td>"
+                f"<td><a href=\"{page_link(first_pages[name])}\">Page {first_pages[name]}</a></td></tr>"
+                for name, count in counts.most_common())
+            return (f"<h3>{title}</h3>\n<table class=\"summary\">"
+                    f"<tr><th>{label}</th><th>Findings</th><th>First page</th></tr>"
+                    f"{rows}</table>\n")
+
+        page_rows = "".join(
+            f"<tr><td><a href=\"{page_link(number)}\">Page {number}</a></td>"
+            f"<td>{first_row} / {last_row}</td><td>{count}</td></tr>"
+            for number, (first_row, last_row, count) in enumerate(pages, start=1))
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write(ReportGenerator.generate_html_header(file_name, len(findings)))
+            if findings:
+                f.write(count_table("Findings per check", "Check",
+                                    check_counts, check_pages))
+                f.write(count_table("Findings per attribute", "Attribute",
+                                    attribute_counts, attribute_pages))
+                f.write("<h3>Pages</h3>\n<table class=\"summary\">"
+                        "<tr><th>Page</th><th>Rows of first / last finding</th><th>Findings</th></tr>"
+                        f"{page_rows}</table>\n")
+            else:
+                f.write("<p>No issues found.</p>\n")
+            f.write(ReportGenerator.generate_html_footer())
+
+        # Persist the diffs of this report for later runs
+        ReportGenerator.text_differ().flush()
+
+        return report_file
+
+    @staticmethod
+    def _page_name(page_number):
+        return f"page_{page_number:04d}.html"
+
+    @staticmethod
+    def iter_html_page(file_name, findings, page_number, page_count,
+                       total_issues, index_link):
+        """
+        Generate one page of a paged HTML report piece by piece.
+
+        Args:
+            file_name (str): Name of the checked file shown in the report
+            findings (list): Finding instances of the page
+            page_number (int): Number of the page, starting at 1
+            page_count (int): Number of pages of the report
+            total_issues (int): Number of findings of the whole report
+            index_link (str): Relative link from the page to the index page
+
+        Yields:
+            str: The next piece of the HTML document
+        """
+        links = [f'<a href="{index_link}">Index</a>']
+        if page_number > 1:
+            links.append(f'<a href="{ReportGenerator._page_name(page_number - 1)}">&laquo; Previous</a>')
+        links.append(f"Page {page_number} of {page_count}")
+        if page_number < page_count:
+            links.append(f'<a href="{ReportGenerator._page_name(page_number + 1)}">Next &raquo;</a>')
+        navigation = f'<div class="nav">{" ".join(links)}</div>\n'
+
+        yield ReportGenerator.generate_html_header(
+            file_name, f"{total_issues} (this page: {len(findings)})")
+        yield navigation
+        for finding in findings:
+            yield ReportGenerator.format_issue(finding)
+            yield "\n"
+        yield navigation
+        yield ReportGenerator.generate_html_footer()
+
     @staticmethod
     def generate_report(file_path, report_folder, report_type,  findings):
         """
@@ -254,7 +426,10 @@ class ReportGenerator:
         Args:
             file_path (str): Path to the input Excel file
             report_folder (str): Directory where the report should be saved
-            findings (list): List of dictionaries containing issue details
+            report_type (str): 'HTML', 'HTML_Paged' (see generate_paged_html_report),
+                'HTML_Virtual' (see VirtualReport), 'Excel' or 'Excel_Sheets'
+                (one sheet per check, see ExcelReport)
+            findings (list): Finding instances to report
 
         Returns:
             str: Path to the generated report file
@@ -262,24 +437,25 @@ class ReportGenerator:
         report_type = report_type.lower()
         if report_type == 'excel':
             return ReportGenerator.generate_excel_report(file_path,report_folder, findings)
+        elif report_type == 'excel_sheets':
+            return ExcelReport.generate(file_path, report_folder, findings)
+        elif report_type == 'html_paged':
+            return ReportGenerator.generate_paged_html_report(file_path, report_folder, findings)
+        elif report_type == 'html_virtual':
+            return VirtualReport.generate(file_path, report_folder, findings,
+                                          CheckConfiguration.DIFF_MAX_COST)
         else:
             # Create report filename
             base_name = os.path.basename(file_path).replace('.xlsx', '')
             report_file = os.path.join(report_folder, f"{base_name}_report.html")
 
-            # Generate issues content
-            issues_content = "\n".join(
-                ReportGenerator.format_issue(finding) for finding in findings)
-
-            # Generate the complete HTML content
-            html_content = ReportGenerator.generate_html_content(
-                file_name=os.path.basename(file_path),
-                total_issues=len(findings),
-                issues_content=issues_content
-            )
-
-            # Write the report
+            # Stream the HTML content to the report, one issue at a time
             with open(report_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+                for chunk in ReportGenerator.iter_html_report(
+                        os.path.basename(file_path), findings):
+                    f.write(chunk)
+
+            # Persist the diffs of this report for later runs
+            ReportGenerator.text_differ().flush()
 
             return report_file
@@ -1,17 +1,46 @@
-import html
+import json
 import os
-import re
 import zipfile
 import shutil
 import glob
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
 import pyreqif.reqif
 import pyreqif.rif
 import pyreqif.xlsx
+import xlsxwriter
+
+from HelperFunc import HelperFunctions
+from projconfig import CheckConfiguration
+from reqif_archive import ReqIFArchiveReader
+from reqif_stream import ReqIFStreamParser
+import reqif_text
+
+# Processor instance installed once per worker process by _init_worker
+_worker_processor = None
+
+
+def _init_worker(processor):
+    """Install the processor in a worker process."""
+    global _worker_processor
+    _worker_processor = processor
+
+
+def _convert_archive_in_worker(item):
+    return _worker_processor.convert_archive(item)
 
 
 class ReqIF2ExcelProcessor:
+    # Manifest of the incremental conversion, stored in the Excel folder
+    MANIFEST_FILE = "conversion_manifest.json"
+
     def __init__(self, source_folder, reqif_folder, excel_folder,
-                 check_type=0):
+                 check_type=0, streaming=False, incremental=False,
+                 in_memory=False, workers=1):
         """
         Initialize the ReqIF2Excel Processor with source and destination folders
 
@@ -20,11 +49,24 @@ class ReqIF2ExcelProcessor:
             reqif_folder (str): Path to extract REQIF/XML files
             excel_folder (str): Path to store converted Excel files
             check_type (int, optional): 0 for Import Check, 1 for Export Check. Defaults to 0.
+            streaming (bool, optional): Convert with the incremental ReqIFStreamParser
+                instead of pyreqif.reqif.load. Defaults to False.
+            incremental (bool, optional): Only reconvert archives that are new or
+                changed since the last run of process(). Defaults to False.
+            in_memory (bool, optional): Read the REQIF/XML files straight from the
+                archives instead of extracting them to the reqif folder. Defaults to False.
+            workers (int, optional): Number of worker processes extracting and
+                converting the archives (1 = sequential). Defaults to 1.
         """
         self.source_folder = source_folder
         self.reqif_folder = reqif_folder
         self.excel_folder = excel_folder
         self.check_type = check_type
+        self.streaming = streaming
+        self.incremental = incremental
+        self.in_memory = in_memory
+        self.workers = max(1, workers or 1)
+        self.timings = []  # (archive, document, output file, seconds) per converted document
 
     def extract_all_files(self):
         """
@@ -36,36 +78,47 @@ class ReqIF2ExcelProcessor:
                     file_path = os.path.join(root, file)
                     self._extract_zip_recursive(file_path)
 
-    def _extract_zip_recursive(self, file_path):
+    def _extract_zip_recursive(self, file_path, target_folder=None):
         """
         Recursively extract nested ZIP files
 
         Args:
             file_path (str): Path to the ZIP file to extract
+            target_folder (str, optional): Folder to extract to. Defaults to the reqif folder.
         """
+        if target_folder is None:
+            target_folder = self.reqif_folder
         try:
             if not zipfile.is_zipfile(file_path):
                 print(f"Skipping invalid zip file: {file_path}")
                 return
 
             with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                zip_ref.extractall(self.reqif_folder)
+                zip_ref.extractall(target_folder)
                 for name in zip_ref.namelist():
-                    nested_zip_path = os.path.join(self.reqif_folder, name)
+                    nested_zip_path = os.path.join(target_folder, name)
                     if nested_zip_path.endswith(
                             '.zip') or nested_zip_path.endswith('.reqifz'):
-                        self._extract_zip_recursive(nested_zip_path)
+                        self._extract_zip_recursive(nested_zip_path,
+                                                    target_folder)
 
         except zipfile.BadZipFile:
             print(f"Error: {file_path} is not a valid zip file.")
         except Exception as e:
             print(f"Unexpected error with file {file_path}: {e}")
 
-    def prepare_folders(self):
+    def prepare_folders(self, excel=True):
         """
         Delete and recreate destination folders
+
+        Args:
+            excel (bool, optional): Also recreate the Excel folder; leave it
+                untouched when no Excel files will be written. Defaults to True.
         """
-        for folder in [self.reqif_folder, self.excel_folder]:
+        folders = [self.reqif_folder]
+        if excel:
+            folders.append(self.excel_folder)
+        for folder in folders:
             self.delete_folder(folder)
             os.makedirs(folder, exist_ok=True)
 
@@ -117,16 +170,19 @@ class ReqIF2ExcelProcessor:
             print(
                 f"Error deleting files except '{allowed_extensions}': {str(e)}")
 
-    def get_reqif_files(self):
+    def get_reqif_files(self, folder=None):
         """
         Find all REQIF and XML files in the extraction folder
 
+        Args:
+            folder (str, optional): Folder to search. Defaults to the reqif folder.
+
         Returns:
             list: Paths to REQIF and XML files
         """
         try:
             files_list = []
-            for root, _, files in os.walk(self.reqif_folder):
+            for root, _, files in os.walk(folder or self.reqif_folder):
                 for file in files:
                     if file.endswith('.reqif') or file.endswith('.xml'):
                         files_list.append(os.path.join(root, file))
@@ -148,76 +204,472 @@ class ReqIF2ExcelProcessor:
             Returns:
                 str: The cleaned text.
         """
-        if not raw_text:
-            return ""
+        # Tags are removed, whitespace is collapsed and HTML entities (e.g.,
+        # &#196; to Ä) are decoded in a single scan
+        return reqif_text.clean_text(raw_text)
 
-        # Remove self-closing tags and attributes (like <br/>, <object ... />)
-        raw_text = re.sub(r'<[^>]+?/>', '', raw_text)
-
-        # Remove full HTML tags (e.g., <b>...</b>, <div>...</div>)
-        raw_text = re.sub(r'<[^>]+>', '', raw_text)
-
-        # Remove multiple consecutive whitespaces
-        raw_text = re.sub(r'\s+', ' ', raw_text)
-
-        # Decode HTML entities (e.g., &#196; to Ä)
-        cleaned_text = html.unescape(raw_text)
-
-        # Strip leading and trailing whitespace
-        return cleaned_text
-
-    def convert_to_excel(self):
+    def convert_to_excel(self, sources=None):
         """
         Convert REQIF/XML files to Excel.
         This method performs the following steps:
-        1. Changes the current working directory to the Excel folder.
-        2. Iterates over the list of REQIF/XML files.
-        3. For each file:
+        1. Iterates over the list of REQIF/XML files.
+        2. For each file:
             - Loads the REQIF document.
             - Iterates over the requirements in the document.
-            - Prints the requirement ID and long name.
             - Iterates over the values of each requirement.
             - Cleans the HTML content of each value.
             - Updates the value with the cleaned content.
-            - Dumps the cleaned document to an Excel file.
-        4. Changes back to the original working directory.
+            - Dumps the cleaned document to an Excel file in the Excel folder.
+        The working directory is never changed, so conversions can run concurrently.
+
+        Args:
+            sources (iterable, optional): (name, path or binary stream) pairs of
+                the REQIF/XML documents to convert. Defaults to iter_sources().
+
+        Returns:
+            list: Paths to the Excel files that were written
         """
-        original_path = os.getcwd()
-        os.chdir(self.excel_folder)
+        if sources is None:
+            sources = self.iter_sources()
 
-        for file in self.get_reqif_files():
+        results = self._convert_sources(sources)
+        self.timings += [(None, name, output_file, seconds)
+                         for name, output_file, seconds in results]
+        return [output_file for _, output_file, _ in results
+                if output_file is not None]
+
+    def _convert_sources(self, sources):
+        """
+        Convert REQIF/XML documents and time each conversion.
+        The partial output of a failed conversion is deleted, so that no
+        incomplete sheet is left in the Excel folder.
+
+        Returns:
+            list: (name, output file or None on error, seconds) per document
+        """
+        results = []
+        for name, source in sources:
+            start = time.perf_counter()
+            base_filename = os.path.splitext(os.path.basename(name))[0]
+            output_file = os.path.join(self.excel_folder,
+                                       f"{base_filename}_local_conversion.xlsx")
             try:
-                base_filename = os.path.splitext(os.path.basename(file))[0]
-                reqif_document = pyreqif.reqif.load(file)
-
-                for requirement in reqif_document.requirementList:
-                    for value in requirement.values:
-                        # Check for content, handling potential None values
-                        content = getattr(value, '_content', None)
-                        if content is not None:
-                            # Decode bytes if necessary
-                            if isinstance(content, bytes):
-                                content = content.decode('utf-8')
-                            # Clean the HTML content
-                            cleaned_content = self.clean_text(content)
-                            value._content = cleaned_content
-
-                pyreqif.xlsx.dump(reqif_document,
-                                  f"{base_filename}_local_conversion.xlsx")
+                self.convert_file(source, output_file)
+            except Exception as e:
+                print(f"Error converting {name}: {e}")
+                if os.path.exists(output_file):
+                    os.remove(output_file)
+                    print(f"Deleted partial output: {output_file}")
+                output_file = None
+            results.append((name, output_file, time.perf_counter() - start))
+        return results
+
+    def convert_file(self, source, output_file):
+        """
+        Convert a single REQIF/XML document to an Excel file.
+
+        Args:
+            source (str or file): Path or binary stream of the REQIF/XML document
+            output_file (str): Path of the Excel file to write
+        """
+        if self.streaming:
+            self.convert_streaming(source, output_file)
+            return
+
+        reqif_document = pyreqif.reqif.load(source)
+
+        values = []
+        contents = []
+        for requirement in reqif_document.requirementList:
+            for value in requirement.values:
+                # Check for content, handling potential None values
+                content = getattr(value, '_content', None)
+                if content is not None:
+                    # Decode bytes if necessary
+                    if isinstance(content, bytes):
+                        content = content.decode('utf-8')
+                    values.append(value)
+                    contents.append(content)
+
+        # Clean the HTML content of all values at once
+        for value, cleaned_content in zip(values,
+                                          reqif_text.clean_texts(contents)):
+            value._content = cleaned_content
+
+        pyreqif.xlsx.dump(reqif_document, output_file)
+
+    def iter_sources(self):
+        """
+        Yield the REQIF/XML documents to convert.
+
+        In in-memory mode the documents are read from the archives of the
+        source folder, otherwise from the extracted files of the reqif folder.
+
+        Yields:
+            tuple: Name of the document and its path or binary stream
+        """
+        if not self.in_memory:
+            for file in self.get_reqif_files():
+                yield file, file
+            return
+
+        for file_path in self._find_archives().values():
+            yield from ReqIFArchiveReader(file_path).iter_reqif()
+
+    def reqif_to_dataframe(self, file):
+        """
+        Convert a REQIF/XML file straight into the DataFrame layout of the checks.
+
+        The result equals reading the *_local_conversion.xlsx file of
+        convert_streaming with pd.read_excel(keep_default_na=False,
+        na_values=['']): one column per attribute plus 'reqifId', rows in
+        SPEC-HIERARCHY order and empty cells as NaN. The pyreqif conversion
+        writes the same rows.
+
+        Args:
+            file (str or file): Path or binary stream of the REQIF/XML file
+
+        Returns:
+            DataFrame: The converted requirements
+        """
+        parser = ReqIFStreamParser(file, clean_text=self.clean_text)
+        requirements = {requirement['reqifId']: requirement
+                        for requirement in parser.iter_requirements()}
+
+        # pyreqif.xlsx.dump writes the rows in SPEC-HIERARCHY order
+        rows = [requirements[ref] for ref, _ in parser.hierarchy
+                if ref in requirements]
+        df = pd.DataFrame.from_records(rows,
+                                       columns=parser.fields + ["reqifId"])
+        return df.where(df.ne(""), np.nan)
+
+    def convert_to_dataframes(self, write_excel=False):
+        """
+        Convert REQIF/XML files to DataFrames without the Excel round trip.
+
+        Args:
+            write_excel (bool, optional): Also export each sheet to the Excel
+                folder. Defaults to False.
+
+        Returns:
+            dict: DataFrame per path of the *_local_conversion.xlsx file it stands for
+        """
+        frames = {}
+        for name, file in self.iter_sources():
+            try:
+                base_filename = os.path.splitext(os.path.basename(name))[0]
+                output_file = os.path.join(
+                    self.excel_folder, f"{base_filename}_local_conversion.xlsx")
+                df = self.reqif_to_dataframe(file)
+                if write_excel:
+                    df.to_excel(output_file, sheet_name="Export", index=False,
+                                engine="xlsxwriter")
+                frames[output_file] = df
 
             except Exception as e:
-                print(f"Error converting {file}: {e}")
+                print(f"Error converting {name}: {e}")
+
+        return frames
 
-        os.chdir(original_path)
+    def convert_streaming(self, file, output_file):
+        """
+        Convert a REQIF/XML file to Excel without loading the whole document.
+
+        Requirements are parsed one at a time by ReqIFStreamParser and written
+        row by row with xlsxwriter in constant memory mode, so peak memory is
+        bounded by the size of a single requirement plus a small index entry
+        per requirement. The sheet has the same columns and rows as the
+        pyreqif.xlsx.dump output: rows follow the SPEC-HIERARCHY, objects
+        outside the hierarchy are left out and objects referenced twice repeated.
+        The hierarchy follows the SPEC-OBJECTS in the document, so the parsed
+        requirements are spilled to a temporary file and written in a second
+        pass; only their file offsets are kept in memory.
+
+        Args:
+            file (str): Path to the REQIF/XML file
+            output_file (str): Path of the Excel file to write
+        """
+        parser = ReqIFStreamParser(file, clean_text=self.clean_text)
+        with tempfile.TemporaryFile() as spill:
+            offsets = {}  # reqifId -> offset of the pickled requirement in spill
+            for requirement in parser.iter_requirements():
+                offsets[requirement['reqifId']] = spill.tell()
+                pickle.dump(requirement, spill, protocol=pickle.HIGHEST_PROTOCOL)
+
+            workbook = xlsxwriter.Workbook(output_file, {'constant_memory': True})
+            worksheet = workbook.add_worksheet("Export")
+            cell_format = workbook.add_format()
+            cell_format.set_text_wrap()
+            try:
+                columns = self._write_header(worksheet, parser.fields)
+                row = 0
+                # Same rows as pyreqif.xlsx.dump and reqif_to_dataframe
+                for ref, _ in parser.hierarchy:
+                    offset = offsets.get(ref)
+                    if offset is None:
+                        continue
+                    spill.seek(offset)
+                    requirement = pickle.load(spill)
+                    row += 1
+                    worksheet.set_row(row, None, cell_format)
+                    for col, value in requirement.items():
+                        if value and col in columns:
+                            worksheet.write_string(row, columns[col], value)
+            finally:
+                workbook.close()
+
+    @staticmethod
+    def _write_header(worksheet, fields):
+        """Write the header row and return the column index of each field."""
+        columns = {}
+        for col in fields + ["reqifId"]:
+            columns[col] = len(columns)
+            worksheet.write_string(0, columns[col], col)
+        worksheet.set_column(0, len(columns), 20)
+        if "ReqIF.Text" in columns:
+            worksheet.set_column(columns["ReqIF.Text"], columns["ReqIF.Text"],
+                                 100)
+        return columns
 
     def process(self):
         """
         Main processing method to orchestrate the entire workflow
         """
+        if self.incremental:
+            self.process_incremental()
+            return
+
         self.prepare_folders()
-        self.extract_all_files()
-        self.clean_reqif_folder()
-        self.convert_to_excel()
+        self.timings = []
+        if self.workers > 1:
+            list(self.convert_archives(self._find_archives()))
+        else:
+            if not self.in_memory:
+                self.extract_all_files()
+                self.clean_reqif_folder()
+            self.convert_to_excel()
+        self.print_timing_summary()
+
+    def process_incremental(self):
+        """
+        Convert only the archives that are new or changed since the last run.
+
+        Every archive is extracted into its own subfolder of the reqif folder
+        (or read in memory).
+        A manifest in the Excel folder records the content hash and the Excel
+        files of each converted archive; outputs of archives that disappeared
+        from the source folder are deleted. Archives with a document that
+        failed to convert are recorded without hash, so they are converted
+        again on the next run. The manifest is rewritten
+        atomically after each archive, so an interrupted run only causes the
+        unfinished archive to be converted again.
+        """
+        os.makedirs(self.reqif_folder, exist_ok=True)
+        os.makedirs(self.excel_folder, exist_ok=True)
+
+        manifest = self._load_manifest()
+        entries = manifest["archives"]
+        archives = self._find_archives()
+
+        # Remove the outputs of archives that no longer exist
+        for key in sorted(set(entries) - set(archives)):
+            print(f"Source removed, deleting its outputs: {key}")
+            self._remove_outputs(entries.pop(key))
+            self._remove_extraction(key)
+            self._write_manifest(manifest)
+
+        changed = {}
+        for key, file_path in sorted(archives.items()):
+            file_hash = HelperFunctions.file_hash(file_path)
+            entry = entries.get(key)
+            if (entry is not None and entry["hash"] == file_hash
+                    and all(os.path.exists(os.path.join(self.excel_folder, output))
+                            for output in entry["outputs"])):
+                continue
+
+            print(f"Converting {'changed' if entry else 'new'} archive: {key}")
+            if entry is not None:
+                self._remove_outputs(entries.pop(key))
+                self._write_manifest(manifest)
+            changed[key] = (file_path, file_hash)
+
+        self.timings = []
+        failed = 0
+        for key, outputs, complete in self.convert_archives(
+                {key: file_path for key, (file_path, _) in changed.items()}):
+            if not complete:
+                print(f"Not all documents of {key} were converted, "
+                      f"it is converted again on the next run.")
+                failed += 1
+            entries[key] = {
+                "hash": changed[key][1] if complete else None,
+                "outputs": [os.path.basename(output) for output in outputs]
+            }
+            self._write_manifest(manifest)
+
+        print(f"Incremental conversion finished: {len(changed) - failed} converted, "
+              f"{failed} failed, {len(archives) - len(changed)} unchanged.")
+        self.print_timing_summary()
+
+    def convert_archives(self, archives):
+        """
+        Extract and convert archives, on a process pool if workers > 1.
+
+        Every archive is extracted into its own subfolder of the reqif folder
+        (or read in memory), so workers never share files.
+
+        Args:
+            archives (dict): Archive path per archive key (see _find_archives)
+
+        Yields:
+            tuple: Archive key, the Excel files written for it and whether all
+                   its documents were converted, in the order of archives;
+                   timings are collected in self.timings
+        """
+        items = list(archives.items())
+        if self.workers > 1 and len(items) > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers,
+                                           initializer=_init_worker,
+                                           initargs=(self,))
+            results = executor.map(_convert_archive_in_worker, items)
+        else:
+            executor = None
+            results = map(self.convert_archive, items)
+
+        try:
+            for key, results_of_archive in results:
+                self.timings += [(key, name, output_file, seconds)
+                                 for name, output_file, seconds in results_of_archive]
+                outputs = [output_file for _, output_file, _ in results_of_archive
+                           if output_file is not None]
+                yield key, outputs, len(outputs) == len(results_of_archive)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def convert_archive(self, item):
+        """
+        Extract (or read in memory) and convert a single archive.
+
+        Args:
+            item (tuple): Archive key and archive path
+
+        Returns:
+            tuple: Archive key and (name, output file or None, seconds) per
+                   converted document; extraction time is added to the first document
+        """
+        key, file_path = item
+        start = time.perf_counter()
+        target_folder = self._remove_extraction(key)
+        if self.in_memory:
+            sources = ReqIFArchiveReader(file_path).iter_reqif()
+        else:
+            os.makedirs(target_folder, exist_ok=True)
+            self._extract_zip_recursive(file_path, target_folder)
+            self.delete_files_except_extensions(target_folder, ['reqif', 'xml'])
+            sources = ((file, file) for file in self.get_reqif_files(target_folder))
+        extraction_time = time.perf_counter() - start
+
+        results = self._convert_sources(sources)
+        if results:
+            name, output_file, seconds = results[0]
+            results[0] = (name, output_file, seconds + extraction_time)
+        return key, results
+
+    def print_timing_summary(self):
+        """Print the conversion time of each document, slowest first."""
+        if not self.timings:
+            return
+        print("\nConversion timing summary:")
+        for archive, name, output_file, seconds in sorted(
+                self.timings, key=lambda timing: timing[3], reverse=True):
+            source = f"{archive}: {name}" if archive else name
+            status = "" if output_file is not None else "  (failed)"
+            print(f"  {seconds:8.2f} s  {source}{status}")
+        print(f"Converted {sum(1 for timing in self.timings if timing[2] is not None)} "
+              f"of {len(self.timings)} files in "
+              f"{sum(timing[3] for timing in self.timings):.2f} s (sum over all workers)")
+
+    def _find_archives(self):
+        """Return the ZIP/REQIFZ files of the source folder by relative path."""
+        archives = {}
+        source_folder = os.path.abspath(self.source_folder)
+        for root, _, files in sorted(os.walk(source_folder)):
+            for file in sorted(files):
+                if file.endswith('.zip') or file.endswith('.reqifz'):
+                    file_path = os.path.join(root, file)
+                    key = os.path.relpath(file_path, source_folder)
+                    archives[key.replace(os.sep, '/')] = file_path
+        return archives
+
+    def _manifest_state(self):
+        """Settings that invalidate all converted outputs when they change."""
+        return {"converter_version": CheckConfiguration.CONVERTER_VERSION,
+                "streaming": self.streaming}
+
+    def _load_manifest(self):
+        manifest_path = os.path.join(self.excel_folder, self.MANIFEST_FILE)
+        manifest = {**self._manifest_state(), "archives": {}}
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return manifest
+        except Exception as e:
+            print(f"Error reading manifest '{manifest_path}', converting all archives: {e}")
+            return manifest
+
+        if all(stored.get(name) == value
+               for name, value in self._manifest_state().items()):
+            manifest["archives"] = stored.get("archives", {})
+        else:
+            # Converter changed: outputs are rebuilt and replaced one by one
+            manifest["archives"] = {
+                key: {"hash": None, "outputs": entry.get("outputs", [])}
+                for key, entry in stored.get("archives", {}).items()}
+        return manifest
+
+    def _write_manifest(self, manifest):
+        """Write the manifest to a temporary file and atomically replace the old one."""
+        manifest_path = os.path.join(self.excel_folder, self.MANIFEST_FILE)
+        temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, manifest_path)
+
+    def _remove_outputs(self, entry):
+        for output in entry["outputs"]:
+            output_path = os.path.join(self.excel_folder, output)
+            if os.path.exists(output_path):
+                os.remove(output_path)
+                print(f"Deleted file: {output_path}")
+
+    def _remove_extraction(self, key):
+        """Delete the extraction subfolder of an archive and return its path."""
+        target_folder = os.path.join(self.reqif_folder,
+                                     key.replace('/', '__') + "_extracted")
+        if os.path.isdir(target_folder):
+            shutil.rmtree(target_folder, ignore_errors=True)
+        return target_folder
+
+    def process_to_dataframes(self, write_excel=False):
+        """
+        Run the workflow with the in-memory conversion instead of convert_to_excel.
+
+        Args:
+            write_excel (bool, optional): Also export the Excel files. Defaults to False.
+
+        Returns:
+            dict: DataFrame per path of the Excel file it stands for,
+                  ready for ChecksProcessorExcel.process_dataframes
+        """
+        self.prepare_folders(excel=write_excel)
+        if not self.in_memory:
+            self.extract_all_files()
+            self.clean_reqif_folder()
+        return self.convert_to_dataframes(write_excel)
 
 
 def main(check_type):
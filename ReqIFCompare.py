@@ -0,0 +1,388 @@
+import os
+from bisect import bisect_left
+from operator import itemgetter
+
+from Findings import Finding
+from HelperFunc import FINGERPRINT_COLUMN, FINGERPRINT_EXCLUDED, HelperFunctions
+from reqif_stream import ReqIFStreamParser
+from reqif_text import clean_text
+
+# Attribute holding the identifier a requirement has in the other party's tool
+FOREIGN_ID_ATTRIBUTE = 'ReqIF.ForeignID'
+# Key of the SPEC-OBJECT identifier in the parsed requirements
+IDENTIFIER_KEY = 'reqifId'
+# Attributes shown for added and removed requirements, if present
+SUMMARY_ATTRIBUTES = ['Object ID', 'ReqIF.Text', 'Object Text']
+# Kinds of SPEC-HIERARCHY changes, see ReqIFComparison
+HIERARCHY_CHANGES = ('moved', 'reparented', 'reordered')
+# Parent of a node whose customer parent has no counterpart in the own document
+_UNMATCHED_PARENT = object()
+
+
+class SpecObject:
+    """A parsed SPEC-OBJECT with its content fingerprint."""
+
+    __slots__ = ('identifier', 'foreign_id', 'position', 'row', 'values',
+                 'fingerprint')
+
+    def __init__(self, identifier, foreign_id, position, values, fingerprint):
+        self.identifier = identifier
+        self.foreign_id = foreign_id
+        self.position = position  # Index in document order
+        # Excel row in the converted sheet, 0 if not in the SPEC-HIERARCHY
+        self.row = 0
+        self.values = values  # Attribute long name -> value, identifiers excluded
+        self.fingerprint = fingerprint
+
+
+class ReqIFIndex:
+    """
+    Hash indexes of the SPEC-OBJECTs of one ReqIF document.
+
+    The document is parsed with ReqIFStreamParser, values are cleaned like
+    the ReqIF to Excel conversion. Every object carries the fingerprint the
+    parser computes (HelperFunctions.requirement_fingerprint), so unchanged
+    objects are recognized without comparing their attributes.
+    """
+
+    def __init__(self, source, ignored_attributes=()):
+        """
+        Args:
+            source (str or file): Path or binary stream of the .reqif document
+            ignored_attributes (iterable, optional): Attributes left out of
+                fingerprints and comparisons
+        """
+        self.name = os.path.basename(getattr(source, 'name', source))
+        self.objects = []  # SpecObjects in document order
+        self.by_identifier = {}
+        self.by_foreign_id = {}
+
+        excluded = FINGERPRINT_EXCLUDED + tuple(ignored_attributes)
+        parser = ReqIFStreamParser(source, clean_text,
+                                   fingerprints=not ignored_attributes)
+        for requirement in parser.iter_requirements():
+            if ignored_attributes:
+                fingerprint = HelperFunctions.requirement_fingerprint(
+                    requirement, excluded)
+            else:
+                fingerprint = requirement[FINGERPRINT_COLUMN]
+            self._add(requirement, excluded, fingerprint)
+        self.hierarchy = parser.hierarchy
+
+        # The converted sheets list the requirements in SPEC-HIERARCHY order
+        # below a header row; objects referenced twice keep their first row
+        row = 2
+        for identifier, _ in self.hierarchy:
+            spec_object = self.by_identifier.get(identifier)
+            if spec_object is not None:
+                if not spec_object.row:
+                    spec_object.row = row
+                row += 1
+
+    def tree(self):
+        """
+        Return the SPEC-HIERARCHY as {identifier: [parent identifier, position, child count]}.
+
+        The position is the index in the pre-order walk of the hierarchy, so
+        siblings keep their order; top-level nodes have the parent None.
+        Objects referenced more than once keep their first place.
+        """
+        nodes = {}
+        path = []  # Identifiers of the ancestors of the current node, by depth
+        for position, (identifier, depth) in enumerate(self.hierarchy):
+            del path[depth:]
+            parent = path[-1] if path else None
+            if identifier not in nodes:
+                nodes[identifier] = [parent, position, 0]
+                if parent is not None:
+                    nodes[parent][2] += 1
+            path.append(identifier)
+        return nodes
+
+    def _add(self, requirement, excluded, fingerprint):
+        identifier = requirement.get(IDENTIFIER_KEY)
+        foreign_id = requirement.get(FOREIGN_ID_ATTRIBUTE) or None
+        values = {name: value for name, value in requirement.items()
+                  if name not in excluded}
+        spec_object = SpecObject(identifier, foreign_id, len(self.objects),
+                                 values, fingerprint)
+        self.objects.append(spec_object)
+        if identifier is not None:
+            self.by_identifier[identifier] = spec_object
+        if foreign_id is not None:
+            self.by_foreign_id[foreign_id] = spec_object
+
+
+class ReqIFComparison:
+    """
+    Result of comparing a customer ReqIF document with the own (Bosch) one.
+
+    Requirements are matched in linear time with the hash indexes of both
+    documents, in this order:
+
+    1. equal SPEC-OBJECT identifiers
+    2. equal 'ReqIF.ForeignID' values
+    3. the foreign ID of one side equal to the identifier of the other side
+
+    Matched pairs with equal fingerprints are unchanged; for the others each
+    attribute that differs after normalization (HelperFunctions.normalize_text,
+    which the fingerprints are based on as well) is reported. Requirements only in the customer
+    document are 'removed', those only in the own document 'added'.
+
+    Matched requirements that are part of both SPEC-HIERARCHY trees are
+    compared by their place in the tree:
+
+    - 'reparented': the parent differs (the parent of the own document is
+      not the counterpart of the customer parent)
+    - 'moved': a reparented node with children, i.e. a whole chapter moved
+      elsewhere; its descendants keep their parent and are not reported
+    - 'reordered': same parent, but the sibling order changed. Per parent,
+      the siblings in the longest increasing subsequence of their own
+      positions (taken in customer order) stay in place and all others are
+      reordered, so moving one node reports one node
+
+    This takes O(n log n) time for n nodes.
+    """
+
+    def __init__(self, customer, own):
+        """
+        Args:
+            customer (ReqIFIndex): Index of the customer document
+            own (ReqIFIndex): Index of the own document
+        """
+        self.customer = customer
+        self.own = own
+        self.matches = []  # (customer SpecObject, own SpecObject)
+        self.added = []  # own SpecObjects without customer counterpart
+        self.removed = []  # customer SpecObjects without own counterpart
+        self.changed = []  # (customer, own, [changed attribute names])
+        self.unchanged = 0
+        # (kind, customer, own, customer parent id, own parent id, child count)
+        self.hierarchy_changes = []
+        self._match()
+        self._diff()
+        self._diff_hierarchy()
+
+    def _match(self):
+        matched_own = set()  # ids of matched own SpecObjects
+        unmatched = []
+        for spec_object in self.customer.objects:
+            counterpart = self.own.by_identifier.get(spec_object.identifier)
+            if counterpart is not None and id(counterpart) not in matched_own:
+                matched_own.add(id(counterpart))
+                self.matches.append((spec_object, counterpart))
+            else:
+                unmatched.append(spec_object)
+
+        # Foreign IDs link requirements whose identifiers differ between tools
+        for spec_object in unmatched:
+            counterpart = None
+            for candidate in (
+                    self.own.by_foreign_id.get(spec_object.foreign_id),
+                    self.own.by_identifier.get(spec_object.foreign_id),
+                    self.own.by_foreign_id.get(spec_object.identifier)):
+                if candidate is not None and id(candidate) not in matched_own:
+                    counterpart = candidate
+                    break
+            if counterpart is None:
+                self.removed.append(spec_object)
+            else:
+                matched_own.add(id(counterpart))
+                self.matches.append((spec_object, counterpart))
+
+        self.added = [spec_object for spec_object in self.own.objects
+                      if id(spec_object) not in matched_own]
+
+    def _diff(self):
+        for customer_object, own_object in self.matches:
+            if customer_object.fingerprint == own_object.fingerprint:
+                self.unchanged += 1
+                continue
+            customer_values = customer_object.values
+            own_values = own_object.values
+            attributes = [name for name in customer_values
+                          if self._normalized(own_values.get(name))
+                          != self._normalized(customer_values[name])]
+            attributes += [name for name in own_values
+                           if name not in customer_values
+                           and self._normalized(own_values[name])]
+            if attributes:
+                self.changed.append((customer_object, own_object, attributes))
+            else:
+                # Only attributes missing on one side and empty on the other
+                self.unchanged += 1
+
+    def _diff_hierarchy(self):
+        customer_tree = self.customer.tree()
+        own_tree = self.own.tree()
+        counterparts = {customer_object.identifier: own_object.identifier
+                        for customer_object, own_object in self.matches}
+
+        siblings = {}  # own parent -> [(customer position, own position, customer, own)]
+        for customer_object, own_object in self.matches:
+            customer_node = customer_tree.get(customer_object.identifier)
+            own_node = own_tree.get(own_object.identifier)
+            if customer_node is None or own_node is None:
+                continue
+            customer_parent, customer_position, _ = customer_node
+            own_parent, own_position, child_count = own_node
+            if customer_parent is None:
+                parent = None
+            else:
+                parent = counterparts.get(customer_parent, _UNMATCHED_PARENT)
+            if parent != own_parent:
+                self.hierarchy_changes.append(
+                    ('moved' if child_count else 'reparented', customer_object,
+                     own_object, customer_parent, own_parent, child_count))
+            else:
+                siblings.setdefault(own_parent, []).append(
+                    (customer_position, own_position, customer_object, own_object))
+
+        for own_parent, entries in siblings.items():
+            entries.sort(key=itemgetter(0))
+            in_place = self.longest_increasing_subsequence(
+                [own_position for _, own_position, _, _ in entries])
+            for index, (_, _, customer_object, own_object) in enumerate(entries):
+                if index not in in_place:
+                    self.hierarchy_changes.append(
+                        ('reordered', customer_object, own_object,
+                         customer_tree[customer_object.identifier][0], own_parent,
+                         own_tree[own_object.identifier][2]))
+
+        self.hierarchy_changes.sort(key=lambda change: change[1].position)
+
+    @staticmethod
+    def longest_increasing_subsequence(values):
+        """
+        Return the indices of a longest strictly increasing subsequence of values.
+
+        Patience sorting with binary search, O(n log n).
+        """
+        tails = []  # tails[k]: index of the smallest last value of a subsequence of length k + 1
+        tail_values = []
+        previous = [-1] * len(values)
+        for index, value in enumerate(values):
+            length = bisect_left(tail_values, value)
+            if length:
+                previous[index] = tails[length - 1]
+            if length == len(tails):
+                tails.append(index)
+                tail_values.append(value)
+            else:
+                tails[length] = index
+                tail_values[length] = value
+
+        result = set()
+        index = tails[-1] if tails else -1
+        while index >= 0:
+            result.add(index)
+            index = previous[index]
+        return result
+
+    @staticmethod
+    def _normalized(value):
+        return HelperFunctions.normalize_text(
+            "" if value is None else str(value))
+
+    def summary(self):
+        """
+        Return the number of matched, unchanged, changed, added and removed
+        requirements and the number of SPEC-HIERARCHY changes per kind.
+        """
+        summary = {'matched': len(self.matches), 'unchanged': self.unchanged,
+                   'changed': len(self.changed), 'added': len(self.added),
+                   'removed': len(self.removed)}
+        summary.update(dict.fromkeys(HIERARCHY_CHANGES, 0))
+        for change in self.hierarchy_changes:
+            summary[change[0]] += 1
+        return summary
+
+    def findings(self):
+        """
+        Return the differences as findings for ReportGenerator.
+
+        Changed requirements give one finding per differing attribute, with
+        both values as customer and Bosch text. Each SPEC-HIERARCHY change
+        gives one finding. Rows are the Excel rows the requirements get in the
+        converted sheets, which follow the SPEC-HIERARCHY; requirements outside
+        the hierarchy are not in the sheets and get row 0.
+        """
+        findings = []
+        for customer_object, own_object, attributes in self.changed:
+            for attribute in attributes:
+                findings.append(Finding(
+                    'reqif_compare_changed',
+                    customer_object.row,
+                    attribute,
+                    f"'{attribute}' differs between the customer and the Bosch ReqIF.",
+                    object_id=customer_object.identifier,
+                    id_column='Identifier',
+                    customer_file=self.customer.name,
+                    customer_text=customer_object.values.get(attribute, ""),
+                    bosch_file=self.own.name,
+                    bosch_text=own_object.values.get(attribute, ""),
+                    details=(('Bosch Identifier', own_object.identifier),)))
+
+        for rule_id, issue, objects, name in (
+                ('reqif_compare_removed',
+                 "Requirement of the customer ReqIF is missing in the Bosch ReqIF.",
+                 self.removed, self.customer.name),
+                ('reqif_compare_added',
+                 "Requirement of the Bosch ReqIF is missing in the customer ReqIF.",
+                 self.added, self.own.name)):
+            for spec_object in objects:
+                findings.append(Finding(
+                    rule_id, spec_object.row, 'Identifier', issue,
+                    object_id=spec_object.identifier,
+                    value=self._describe(spec_object, name)))
+
+        issues = {
+            'moved': "Chapter of the customer ReqIF has another parent in the Bosch ReqIF.",
+            'reparented': "Requirement of the customer ReqIF has another parent in the Bosch ReqIF.",
+            'reordered': "Requirement is at another position among its siblings in the Bosch ReqIF."}
+        for (kind, customer_object, own_object, customer_parent, own_parent,
+             child_count) in self.hierarchy_changes:
+            lines = [f"Identifier: {customer_object.identifier}",
+                     f"Bosch Identifier: {own_object.identifier}",
+                     f"Customer Parent: {customer_parent or '(top level)'}",
+                     f"Bosch Parent: {own_parent or '(top level)'}"]
+            if kind == 'moved':
+                lines.append(f"Child Requirements: {child_count}")
+            lines += [f"{name}: {customer_object.values[name]}"
+                      for name in SUMMARY_ATTRIBUTES if name in customer_object.values]
+            findings.append(Finding(
+                f'reqif_compare_{kind}', customer_object.row,
+                'SPEC-HIERARCHY', issues[kind],
+                object_id=customer_object.identifier, value="\n".join(lines)))
+        return findings
+
+    @staticmethod
+    def _describe(spec_object, file_name):
+        lines = [f"File Name: {file_name}",
+                 f"Identifier: {spec_object.identifier}"]
+        if spec_object.foreign_id is not None:
+            lines.append(f"{FOREIGN_ID_ATTRIBUTE}: {spec_object.foreign_id}")
+        lines += [f"{name}: {spec_object.values[name]}"
+                  for name in SUMMARY_ATTRIBUTES if name in spec_object.values]
+        return "\n".join(lines)
+
+
+class ReqIFComparator:
+    """Compares two ReqIF documents and reports the differences."""
+
+    @staticmethod
+    def compare(customer_source, own_source, ignored_attributes=()):
+        """
+        Compare the customer and the own (Bosch) ReqIF document.
+
+        Args:
+            customer_source (str or file): Path or binary stream of the customer .reqif
+            own_source (str or file): Path or binary stream of the own .reqif
+            ignored_attributes (iterable, optional): Attributes not compared
+
+        Returns:
+            ReqIFComparison: Matched, changed, added and removed requirements
+        """
+        customer = ReqIFIndex(customer_source, ignored_attributes)
+        own = ReqIFIndex(own_source, ignored_attributes)
+        return ReqIFComparison(customer, own)
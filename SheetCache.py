@@ -0,0 +1,148 @@
+import hashlib
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from HelperFunc import HelperFunctions
+
+try:
+    import pyarrow  # noqa: F401  (enables the Feather format)
+    FEATHER_AVAILABLE = True
+except ImportError:
+    FEATHER_AVAILABLE = False
+
+
+class SheetCache:
+    """
+    Content-addressed cache of converted requirement sheets.
+
+    Entries are keyed by the SHA-256 of the source file content and the
+    converter version, so a changed file or a new converter never hits a stale
+    entry. Sheets are stored as Feather (Arrow IPC) files when pyarrow is
+    installed and as pandas pickles otherwise, or when a sheet cannot be
+    represented in Arrow (e.g. mixed-type columns). The folder is capped at
+    max_bytes and the least recently used entries are evicted first.
+    """
+
+    FEATHER_SUFFIX = ".feather"
+    PICKLE_SUFFIX = ".pkl"
+
+    def __init__(self, cache_folder, max_bytes, version):
+        """
+        Args:
+            cache_folder (str): Folder holding the cache entries
+            max_bytes (int): Maximum total size of the cache folder
+            version (str): Converter version, part of every key
+        """
+        self.cache_folder = cache_folder
+        self.max_bytes = max_bytes
+        self.version = version
+
+    def key(self, file_path, variant=""):
+        """
+        Build the cache key of a sheet.
+
+        Args:
+            file_path (str): Source file of the sheet
+            variant (str, optional): Distinguishes differently loaded sheets
+                of the same file (e.g. a column selection)
+        """
+        digest = hashlib.sha256()
+        for part in (HelperFunctions.file_hash(file_path), self.version, variant):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def load(self, file_path, read_function, variant=""):
+        """
+        Return the cached sheet of file_path, reading and storing it on a miss.
+
+        Args:
+            file_path (str): Source file of the sheet
+            read_function (callable): Reads the sheet from the source file
+            variant (str, optional): See key()
+
+        Returns:
+            DataFrame: The sheet
+        """
+        try:
+            key = self.key(file_path, variant)
+            df = self._read_entry(key)
+            if df is not None:
+                return df
+        except Exception as e:
+            print(f"Error reading sheet cache for '{file_path}': {e}")
+            key = None
+
+        df = read_function()
+        if key is not None:
+            try:
+                self._write_entry(key, df)
+                self.evict()
+            except Exception as e:
+                print(f"Error writing sheet cache for '{file_path}': {e}")
+        return df
+
+    def _entry_path(self, key, suffix):
+        return os.path.join(self.cache_folder, key + suffix)
+
+    def _read_entry(self, key):
+        feather_path = self._entry_path(key, self.FEATHER_SUFFIX)
+        pickle_path = self._entry_path(key, self.PICKLE_SUFFIX)
+        if FEATHER_AVAILABLE and os.path.exists(feather_path):
+            os.utime(feather_path)  # Mark as recently used
+            df = pd.read_feather(feather_path)
+            # Arrow returns missing strings as None; the checks expect NaN
+            for col in df.columns[df.dtypes == object]:
+                df[col] = df[col].where(df[col].notna(), np.nan)
+            return df
+        if os.path.exists(pickle_path):
+            os.utime(pickle_path)
+            return pd.read_pickle(pickle_path)
+        return None
+
+    def _write_entry(self, key, df):
+        os.makedirs(self.cache_folder, exist_ok=True)
+        # Write to a unique temporary file first so that concurrent workers
+        # never see a partially written entry
+        temp_path = self._entry_path(key, f".{uuid.uuid4().hex}.tmp")
+        try:
+            if FEATHER_AVAILABLE:
+                try:
+                    df.to_feather(temp_path)
+                    os.replace(temp_path,
+                               self._entry_path(key, self.FEATHER_SUFFIX))
+                    return
+                except Exception:
+                    pass  # Not representable in Arrow, use a pickle instead
+            df.to_pickle(temp_path)
+            os.replace(temp_path, self._entry_path(key, self.PICKLE_SUFFIX))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = []
+        for file_name in os.listdir(self.cache_folder):
+            if not file_name.endswith((self.FEATHER_SUFFIX,
+                                       self.PICKLE_SUFFIX)):
+                continue
+            path = os.path.join(self.cache_folder, file_name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue  # Removed by another worker
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+
+from HelperFunc import HelperFunctions
+
+# Characters per shingle; texts are normalized first, so shingles span words
+SHINGLE_SIZE = 5
+# Buckets larger than this (e.g. many copies of a boilerplate text) only
+# contribute their first allowed entries as candidates
+MAX_BUCKET_CANDIDATES = 50
+# Candidates per query whose exact similarity is computed
+VERIFIED_CANDIDATES = 3
+# Texts hashed per chunk, bounds the memory of the shingle arrays
+CHUNK_TEXTS = 10_000
+
+_PRIME = np.uint64(1_000_003)
+_EMPTY_HASH = np.uint32(0xFFFFFFFF)
+
+
+class SimilarityMatcher:
+    """
+    Finds the most similar text of an indexed set of texts in sub-quadratic time.
+
+    Texts are normalized like HelperFunctions.normalize_text and split into
+    overlapping character shingles. Every text gets a MinHash signature of
+    num_perm values (multiply-shift hashes of the shingles, computed with
+    numpy for all texts of a chunk at once). Locality-sensitive hashing
+    splits the signatures into bands: texts sharing all values of at least
+    one band are candidates. With the defaults (32 values in 8 bands of 4) a
+    pair with a Jaccard similarity of 0.8 becomes a candidate with a
+    probability of 98.5 %, one of 0.3 with 6 %.
+
+    The candidates are ranked by the share of equal signature values and the
+    best ones are verified with their exact Jaccard similarity, which is the
+    reported score.
+    """
+
+    def __init__(self, texts, num_perm=32, bands=8, seed=0):
+        """
+        Args:
+            texts (Series or list): Texts to index, e.g. 'Object Text' of a compare file
+            num_perm (int, optional): Values per MinHash signature
+            bands (int, optional): LSH bands, must divide num_perm
+            seed (int, optional): Seed of the hash functions
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.num_perm = num_perm
+        self.bands = bands
+        random_state = np.random.RandomState(seed)
+        # Odd multipliers for multiply-shift hashing
+        self._multipliers = random_state.randint(
+            0, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._increments = random_state.randint(
+            0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+        self.texts = self._normalize(texts)
+        self.signatures = self.signatures_of(self.texts)
+        self._buckets = [{} for _ in range(bands)]  # band -> {band key: text indices}
+        for index, keys in enumerate(self._band_keys(self.signatures)):
+            if self.texts[index]:
+                for bucket, key in zip(self._buckets, keys):
+                    bucket.setdefault(key, []).append(index)
+        # Arrays, so that large buckets can be filtered by the allowed mask at once
+        for bucket in self._buckets:
+            for key, indices in bucket.items():
+                bucket[key] = np.array(indices, dtype=np.int64)
+
+    @staticmethod
+    def _normalize(texts):
+        if not isinstance(texts, pd.Series):
+            texts = pd.Series(list(texts), dtype=object)
+        return HelperFunctions.normalize_series(texts, stringify=True).tolist()
+
+    def signatures_of(self, texts):
+        """
+        Return the MinHash signatures of normalized texts.
+
+        Args:
+            texts (list): Normalized texts
+
+        Returns:
+            ndarray: One row of num_perm uint32 values per text; empty texts
+                     get only the value 0xFFFFFFFF
+        """
+        signatures = np.full((len(texts), self.num_perm), _EMPTY_HASH,
+                             dtype=np.uint32)
+        for start in range(0, len(texts), CHUNK_TEXTS):
+            chunk = texts[start:start + CHUNK_TEXTS]
+            rows = [row for row, text in enumerate(chunk) if text]
+            if not rows:
+                continue
+            # Texts shorter than a shingle are padded to exactly one shingle
+            padded = [chunk[row].ljust(SHINGLE_SIZE, '\0') for row in rows]
+            shingles, offsets = self._shingle_hashes(padded)
+            for column, (multiplier, increment) in enumerate(
+                    zip(self._multipliers, self._increments)):
+                hashes = (shingles * multiplier + increment) >> np.uint64(32)
+                signatures[start + np.array(rows), column] = np.minimum.reduceat(
+                    hashes, offsets)
+        return signatures
+
+    @staticmethod
+    def _shingle_hashes(texts):
+        """Return the polynomial hashes of all shingles and the offset of each text."""
+        codes = np.frombuffer(''.join(texts).encode('utf-32-le'),
+                              dtype='<u4').astype(np.uint64)
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        counts = lengths - SHINGLE_SIZE + 1
+        text_starts = np.cumsum(lengths) - lengths
+        offsets = np.cumsum(counts) - counts
+
+        # Hash of the shingle starting at every character, across text borders
+        positions = len(codes) - SHINGLE_SIZE + 1
+        hashes = np.zeros(positions, dtype=np.uint64)
+        for shift in range(SHINGLE_SIZE):
+            hashes = hashes * _PRIME + codes[shift:shift + positions]
+
+        # Keep the shingles that lie within one text
+        starts = (np.arange(counts.sum(), dtype=np.int64)
+                  - np.repeat(offsets, counts) + np.repeat(text_starts, counts))
+        return hashes[starts], offsets
+
+    def _band_keys(self, signatures):
+        """Yield the key of every band of each signature."""
+        rows = self.num_perm // self.bands
+        band_views = [np.ascontiguousarray(
+            signatures[:, band * rows:(band + 1) * rows]).view(
+            np.dtype((np.void, rows * 4))).ravel() for band in range(self.bands)]
+        for keys in zip(*(view.tolist() for view in band_views)):
+            yield keys
+
+    def match(self, texts, threshold=0.8, allowed=None):
+        """
+        Pair texts with their most similar indexed text.
+
+        Each query and each indexed text is paired at most once. Pairs are
+        assigned in order of decreasing similarity, so a query whose best
+        candidate is taken by a more similar query falls back to its next
+        verified candidate.
+
+        Args:
+            texts (Series or list): Query texts
+            threshold (float, optional): Lowest Jaccard similarity of a pair
+            allowed (array-like of bool, optional): Indexed texts that may be
+                paired, all if not given
+
+        Returns:
+            list: (query position, indexed position, similarity) tuples
+                  sorted by query position
+        """
+        queries = self._normalize(texts)
+        query_signatures = self.signatures_of(queries)
+        allowed = None if allowed is None else np.asarray(allowed, dtype=bool)
+
+        pairs = []  # (similarity, query position, indexed position)
+        for position, (text, signature, keys) in enumerate(zip(
+                queries, query_signatures, self._band_keys(query_signatures))):
+            if not text:
+                continue
+            candidates = set()
+            for bucket, key in zip(self._buckets, keys):
+                indices = bucket.get(key)
+                if indices is None:
+                    continue
+                if allowed is not None:
+                    indices = indices[allowed[indices]]
+                candidates.update(indices[:MAX_BUCKET_CANDIDATES].tolist())
+            if not candidates:
+                continue
+            candidates = np.array(sorted(candidates), dtype=np.int64)
+
+            estimates = (self.signatures[candidates] == signature).mean(axis=1)
+            shingles = self.shingles(text)
+            for candidate in candidates[np.argsort(-estimates, kind='stable')[:VERIFIED_CANDIDATES]]:
+                similarity = self.jaccard(shingles, self.shingles(self.texts[candidate]))
+                if similarity >= threshold:
+                    pairs.append((similarity, position, int(candidate)))
+
+        # Most similar pairs first; ties go to the earlier query and indexed text
+        pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+        paired_queries, paired_indexed, matches = set(), set(), []
+        for similarity, position, indexed in pairs:
+            if position not in paired_queries and indexed not in paired_indexed:
+                paired_queries.add(position)
+                paired_indexed.add(indexed)
+                matches.append((position, indexed, similarity))
+        return sorted(matches)
+
+    @staticmethod
+    def shingles(text):
+        """Return the set of character shingles of a normalized text."""
+        if len(text) <= SHINGLE_SIZE:
+            return {text}
+        return {text[start:start + SHINGLE_SIZE]
+                for start in range(len(text) - SHINGLE_SIZE + 1)}
+
+    @staticmethod
+    def jaccard(shingles1, shingles2):
+        """Return the Jaccard similarity of two shingle sets."""
+        if not shingles1 and not shingles2:
+            return 1.0
+        return len(shingles1 & shingles2) / len(shingles1 | shingles2)
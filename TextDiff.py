@@ -0,0 +1,169 @@
+import difflib
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+# Words, whitespace runs and single punctuation characters
+_TOKEN_PATTERN = re.compile(r'\w+|\s+|[^\w\s]')
+
+# Diff modes: 'word' diffs tokens of _TOKEN_PATTERN, 'char' single characters
+DIFF_MODES = ('word', 'char')
+
+# Diffs kept in memory, and diffs collected before they are written to the
+# cache file
+MEMORY_ENTRIES = 20_000
+PENDING_ENTRIES = 5_000
+
+
+class TextDiffer:
+    """
+    Highlights the differences between two texts with HTML spans.
+
+    The texts are split into words (mode 'word') or characters (mode 'char')
+    and diffed with difflib.SequenceMatcher. Its run time grows with the
+    product of both token counts; pairs above max_cost are not diffed and
+    highlighted as a whole instead. Results are cached by the SHA-256 of both
+    texts: in memory for duplicate requirements of a run and, if cache_file
+    is given, in a SQLite database for later runs.
+    """
+
+    def __init__(self, mode='word', max_cost=4_000_000, cache_file=None,
+                 max_cache_entries=200_000):
+        """
+        Args:
+            mode (str, optional): 'word' or 'char'
+            max_cost (int, optional): Largest product of the token counts of
+                both texts that is diffed, 0 for no limit
+            cache_file (str, optional): SQLite file persisting the diffs
+            max_cache_entries (int, optional): Entries kept in the cache file,
+                the least recently used are removed first
+        """
+        if mode not in DIFF_MODES:
+            raise ValueError(f"Unknown diff mode '{mode}', expected one of {DIFF_MODES}")
+        self.mode = mode
+        self.max_cost = max_cost
+        self.cache_file = cache_file
+        self.max_cache_entries = max_cache_entries
+        self._memory = {}  # key -> (highlighted text1, highlighted text2)
+        self._pending = {}  # Diffs not yet written to the cache file
+        self._connection = None
+
+    def highlight(self, text1, text2):
+        """
+        Highlight the differences between two texts.
+
+        Args:
+            text1 (str): Text shown as deleted where it differs
+            text2 (str): Text shown as added where it differs
+
+        Returns:
+            tuple: Both texts with their differing parts in
+                   <span class="diff-del"> and <span class="diff-add">
+        """
+        key = self._key(text1, text2)
+        result = self._memory.get(key)
+        if result is None:
+            result = self._read_cache(key)
+            if result is None:
+                result = self._diff(text1, text2)
+                self._pending[key] = result
+                if len(self._pending) >= PENDING_ENTRIES:
+                    self.flush()
+            if len(self._memory) >= MEMORY_ENTRIES:
+                self._memory.clear()
+            self._memory[key] = result
+        return result
+
+    def _diff(self, text1, text2):
+        if self.mode == 'word':
+            tokens1 = _TOKEN_PATTERN.findall(text1)
+            tokens2 = _TOKEN_PATTERN.findall(text2)
+        else:
+            tokens1, tokens2 = text1, text2
+
+        if self.max_cost and len(tokens1) * len(tokens2) > self.max_cost:
+            # Too expensive to diff, highlight the texts as a whole
+            return (f'<span class="diff-del">{text1}</span>',
+                    f'<span class="diff-add">{text2}</span>')
+
+        matcher = difflib.SequenceMatcher(None, tokens1, tokens2)
+        result1, result2 = [], []
+
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            part1 = ''.join(tokens1[i1:i2])
+            part2 = ''.join(tokens2[j1:j2])
+            if op == 'equal':
+                result1.append(part1)
+                result2.append(part2)
+            elif op == 'replace':
+                result1.append(f'<span class="diff-del">{part1}</span>')
+                result2.append(f'<span class="diff-add">{part2}</span>')
+            elif op == 'insert':
+                result2.append(f'<span class="diff-add">{part2}</span>')
+            elif op == 'delete':
+                result1.append(f'<span class="diff-del">{part1}</span>')
+
+        return ''.join(result1), ''.join(result2)
+
+    def _key(self, text1, text2):
+        # The mode and cost cap are part of the key, they change the result
+        digest = hashlib.sha256(f"{self.mode}\0{self.max_cost}\0".encode('utf-8'))
+        digest.update(hashlib.sha256(text1.encode('utf-8')).digest())
+        digest.update(hashlib.sha256(text2.encode('utf-8')).digest())
+        return digest.digest()
+
+    def _connect(self):
+        if self._connection is None and self.cache_file:
+            try:
+                cache_folder = os.path.dirname(self.cache_file)
+                if cache_folder:
+                    os.makedirs(cache_folder, exist_ok=True)
+                self._connection = sqlite3.connect(self.cache_file, timeout=30)
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS diffs ("
+                    "key BLOB PRIMARY KEY, text1 TEXT, text2 TEXT, used REAL)")
+            except (OSError, sqlite3.Error) as e:
+                print(f"Error opening diff cache '{self.cache_file}': {e}")
+                self.cache_file = None
+                self._connection = None
+        return self._connection
+
+    def _read_cache(self, key):
+        connection = self._connect()
+        if connection is None:
+            return None
+        try:
+            row = connection.execute(
+                "SELECT text1, text2 FROM diffs WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading diff cache '{self.cache_file}': {e}")
+            return None
+        if row is None:
+            return None
+        # Mark the entry as used so that it survives pruning
+        self._pending[key] = row
+        return row
+
+    def flush(self):
+        """Write the new diffs to the cache file and prune its oldest entries."""
+        connection = self._connect()
+        if connection is None or not self._pending:
+            self._pending.clear()
+            return
+        now = time.time()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO diffs (key, text1, text2, used) "
+                    "VALUES (?, ?, ?, ?)",
+                    ((key, text1, text2, now)
+                     for key, (text1, text2) in self._pending.items()))
+                connection.execute(
+                    "DELETE FROM diffs WHERE key IN (SELECT key FROM diffs "
+                    "ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_cache_entries,))
+        except sqlite3.Error as e:
+            print(f"Error writing diff cache '{self.cache_file}': {e}")
+        self._pending.clear()
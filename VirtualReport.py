@@ -0,0 +1,330 @@
+import json
+import math
+import os
+from datetime import datetime
+
+# Fields of a finding record in the embedded JSON, in array order; the
+# string-valued fields marked * are indexes into the "strings" table
+RECORD_FIELDS = ('row', 'objectId', 'check*', 'attribute*', 'issue*',
+                 'severity*', 'idColumn*', 'customerFile*', 'boschFile*',
+                 'boschFirst', 'customerText', 'boschText', 'details', 'value')
+
+_STYLE = """
+body { font-family: Arial, sans-serif; margin: 20px; background: #f4f7f9; }
+.container { max-width: 1200px; margin: auto; background: #fff; padding: 20px;
+             border-radius: 10px; box-shadow: 0px 4px 8px rgba(0, 0, 0, 0.1); }
+h2 { color: #003366; }
+.controls { margin: 10px 0; font-size: 14px; }
+.controls input { width: 300px; margin-right: 10px; }
+#viewport { height: 45vh; overflow-y: auto; position: relative;
+            border: 1px solid #ccc; border-radius: 5px; }
+#spacer { position: relative; }
+.row { position: absolute; left: 0; right: 0; height: 28px; line-height: 28px;
+       padding: 0 8px; font-size: 13px; white-space: nowrap; overflow: hidden;
+       text-overflow: ellipsis; border-bottom: 1px solid #eee; cursor: pointer; }
+.row:hover { background: #eef3f8; }
+.row.selected { background: #fff3f3; border-left: 5px solid #ff6b6b; }
+.issue { border-left: 5px solid #ff6b6b; padding: 15px; margin-top: 20px;
+         background: #fff3f3; border-radius: 8px; }
+.issue h2 { color: #d43f3f; margin: 0 0 8px; font-size: 20px; }
+.issue p { margin: 5px 0; font-size: 14px; }
+.code-block { background: #1e1e1e; color: #ffffff; padding: 10px; border-radius: 5px;
+              font-family: 'Courier New', monospace; white-space: pre-wrap;
+              overflow-x: auto; border: 1px solid #ccc; font-size: 13px; line-height: 1.5; }
+.diff-add { background-color: #2da44e; color: white; }
+.diff-del { background-color: #cf222e; color: white; }
+.footer { margin-top: 20px; font-size: 12px; color: #666; text-align: center; }
+"""
+
+# Virtual list: only the rows inside the viewport exist in the DOM. The texts
+# of the selected finding are diffed on demand, by words like TextDiff.TextDiffer
+_SCRIPT = r"""
+(function () {
+  "use strict";
+  var data = JSON.parse(document.getElementById("report-data").textContent);
+  var S = data.strings, rows = data.rows, ROW_HEIGHT = 28, OVERSCAN = 10;
+  var F = {row: 0, objectId: 1, check: 2, attribute: 3, issue: 4, severity: 5,
+           idColumn: 6, customerFile: 7, boschFile: 8, boschFirst: 9,
+           customerText: 10, boschText: 11, details: 12, value: 13};
+  var viewport = document.getElementById("viewport");
+  var spacer = document.getElementById("spacer");
+  var filterInput = document.getElementById("filter");
+  var checkSelect = document.getElementById("check");
+  var counter = document.getElementById("shown");
+  var detail = document.getElementById("detail");
+  var visible = rows.map(function (_, i) { return i; });
+  var selected = -1;
+
+  function str(index) { return index < 0 ? "" : S[index]; }
+  function esc(text) {
+    return String(text).replace(/&/g, "&amp;").replace(/</g, "&lt;")
+                       .replace(/>/g, "&gt;").replace(/"/g, "&quot;");
+  }
+  function summary(r) {
+    return "Row " + r[F.row] + " | " + str(r[F.check]) + " | " +
+           str(r[F.attribute]) + (r[F.objectId] !== null ? " | " + r[F.objectId] : "");
+  }
+
+  var TOKEN = /[\p{L}\p{N}_]+|\s+|[^\p{L}\p{N}_\s]/gu;
+  function span(cls, text) { return '<span class="' + cls + '">' + esc(text) + "</span>"; }
+  function diff(text1, text2) {
+    text1 = text1.trim(); text2 = text2.trim();
+    if (text1 && !text2) { return [span("diff-del", text1), span("diff-add", "Empty")]; }
+    if (text2 && !text1) { return [span("diff-del", "Empty"), span("diff-add", text2)]; }
+    var a = text1.match(TOKEN) || [], b = text2.match(TOKEN) || [];
+    var start = 0, endA = a.length, endB = b.length;
+    while (start < endA && start < endB && a[start] === b[start]) { start++; }
+    while (endA > start && endB > start && a[endA - 1] === b[endB - 1]) { endA--; endB--; }
+    var n = endA - start, m = endB - start;
+    if (data.diffMaxCost && n * m > data.diffMaxCost) {
+      return [span("diff-del", text1), span("diff-add", text2)];
+    }
+    // Longest common subsequence of the differing middle part
+    var width = m + 1, table = new Uint32Array((n + 1) * width), i, j;
+    for (i = n - 1; i >= 0; i--) {
+      for (j = m - 1; j >= 0; j--) {
+        table[i * width + j] = a[start + i] === b[start + j] ?
+          table[(i + 1) * width + j + 1] + 1 :
+          Math.max(table[(i + 1) * width + j], table[i * width + j + 1]);
+      }
+    }
+    var out1 = [esc(a.slice(0, start).join(""))], out2 = [out1[0]];
+    var del = "", add = "";
+    function flush() {
+      if (del) { out1.push(span("diff-del", del)); del = ""; }
+      if (add) { out2.push(span("diff-add", add)); add = ""; }
+    }
+    i = 0; j = 0;
+    while (i < n || j < m) {
+      if (i < n && j < m && a[start + i] === b[start + j]) {
+        flush(); out1.push(esc(a[start + i])); out2.push(esc(b[start + j])); i++; j++;
+      } else if (j >= m || (i < n && table[(i + 1) * width + j] >= table[i * width + j + 1])) {
+        del += a[start + i]; i++;
+      } else {
+        add += b[start + j]; j++;
+      }
+    }
+    flush();
+    out1.push(esc(a.slice(endA).join(""))); out2.push(esc(b.slice(endB).join("")));
+    return [out1.join(""), out2.join("")];
+  }
+
+  function details(r) {
+    if (r[F.customerFile] < 0 && r[F.boschFile] < 0) { return esc(r[F.value] || ""); }
+    var texts = diff(r[F.customerText], r[F.boschText]);
+    var sections = [["Customer", str(r[F.customerFile]), texts[0]],
+                    ["Bosch", str(r[F.boschFile]), texts[1]]];
+    if (r[F.boschFirst]) { sections.reverse(); }
+    var lines = [esc(str(r[F.idColumn]) + ": " + r[F.objectId]) + "\n"];
+    sections.forEach(function (s) {
+      lines.push("---------------");
+      lines.push("       " + s[0] + " File Name: " + esc(s[1]));
+      lines.push("       " + s[0] + " File Object Text: " + s[2]);
+    });
+    lines.push("---------------");
+    r[F.details].forEach(function (d) { lines.push("       " + esc(str(d[0]) + ": " + d[1])); });
+    return lines.join("\n");
+  }
+
+  function showDetail(index) {
+    selected = index;
+    var r = rows[index];
+    detail.innerHTML = '<div class="issue"><h2>⚠️ Row: ' + r[F.row] + "</h2>" +
+      "<p><strong>Attributes:</strong> " + esc(str(r[F.attribute])) + "</p>" +
+      "<p><strong>Check:</strong> " + esc(str(r[F.issue])) + "</p>" +
+      (r[F.severity] >= 0 ? "<p><strong>Severity:</strong> " + esc(str(r[F.severity])) + "</p>" : "") +
+      '<p><strong>Details:</strong></p><div class="code-block">' + details(r) + "</div></div>";
+    render();
+  }
+
+  function render() {
+    var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+    var last = Math.min(visible.length,
+      Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+    var html = [];
+    for (var k = first; k < last; k++) {
+      var index = visible[k];
+      html.push('<div class="row' + (index === selected ? " selected" : "") +
+                '" data-index="' + index + '" style="top:' + (k * ROW_HEIGHT) + 'px">' +
+                esc(summary(rows[index])) + "</div>");
+    }
+    spacer.innerHTML = html.join("");
+  }
+
+  function applyFilter() {
+    var needle = filterInput.value.toLowerCase(), check = checkSelect.value;
+    visible = [];
+    for (var i = 0; i < rows.length; i++) {
+      var r = rows[i];
+      if (check !== "" && String(r[F.check]) !== check) { continue; }
+      if (needle && summary(r).toLowerCase().indexOf(needle) < 0 &&
+          String(r[F.customerText] || r[F.value] || "").toLowerCase().indexOf(needle) < 0 &&
+          String(r[F.boschText] || "").toLowerCase().indexOf(needle) < 0) { continue; }
+      visible.push(i);
+    }
+    spacer.style.height = (visible.length * ROW_HEIGHT) + "px";
+    counter.textContent = visible.length;
+    viewport.scrollTop = 0;
+    render();
+  }
+
+  var counts = {};
+  rows.forEach(function (r) { counts[r[F.check]] = (counts[r[F.check]] || 0) + 1; });
+  Object.keys(counts).forEach(function (check) {
+    var option = document.createElement("option");
+    option.value = check;
+    option.textContent = str(Number(check)) + " (" + counts[check] + ")";
+    checkSelect.appendChild(option);
+  });
+
+  var pending = false;
+  viewport.addEventListener("scroll", function () {
+    if (!pending) { pending = true; requestAnimationFrame(function () { pending = false; render(); }); }
+  });
+  spacer.addEventListener("click", function (event) {
+    var target = event.target.closest(".row");
+    if (target) { showDetail(Number(target.getAttribute("data-index"))); }
+  });
+  var timer = null;
+  filterInput.addEventListener("input", function () {
+    clearTimeout(timer); timer = setTimeout(applyFilter, 200);
+  });
+  checkSelect.addEventListener("change", applyFilter);
+  applyFilter();
+})();
+"""
+
+
+class VirtualReport:
+    """
+    Self-contained HTML report for very large numbers of findings.
+
+    The findings are embedded as compact JSON (one array per finding, repeated
+    strings such as check names and file names stored once) instead of one
+    DOM node per finding. A small script without external dependencies
+    renders only the rows of the list that are scrolled into view and diffs
+    the texts of a finding when it is selected. The file size grows with the
+    finding data only, and the browser holds the visible rows and one detail
+    block.
+    """
+
+    @staticmethod
+    def generate(file_path, report_folder, findings, diff_max_cost=0):
+        """
+        Write the report of a file.
+
+        Args:
+            file_path (str): Path to the input Excel file
+            report_folder (str): Directory where the report should be saved
+            findings (list): Finding instances to report
+            diff_max_cost (int, optional): Largest product of the word counts
+                of two texts that are diffed in the browser, 0 for no limit
+
+        Returns:
+            str: Path to the generated report file
+        """
+        file_name = os.path.basename(file_path)
+        base_name = file_name.replace('.xlsx', '')
+        report_file = os.path.join(report_folder, f"{base_name}_report.html")
+
+        strings = []
+        string_ids = {}
+
+        def ref(value):
+            if value is None:
+                return -1
+            value = str(value)
+            index = string_ids.get(value)
+            if index is None:
+                index = string_ids[value] = len(strings)
+                strings.append(value)
+            return index
+
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write(VirtualReport._header(file_name, len(findings)))
+            f.write('<script type="application/json" id="report-data">{"rows":[')
+            for index, finding in enumerate(findings):
+                if index:
+                    f.write(',')
+                f.write(VirtualReport._dumps(VirtualReport._record(finding, ref)))
+            f.write('],"strings":')
+            f.write(VirtualReport._dumps(strings))
+            f.write(f',"diffMaxCost":{int(diff_max_cost)}}}</script>\n')
+            f.write(f"<script>{_SCRIPT}</script>\n")
+            f.write(VirtualReport._footer())
+
+        return report_file
+
+    @staticmethod
+    def _record(finding, ref):
+        """Array form of a finding, see RECORD_FIELDS."""
+        if finding.has_texts():
+            customer_file = os.path.basename(finding.customer_file)
+            bosch_file = os.path.basename(finding.bosch_file)
+            texts = (VirtualReport._text(finding.customer_text),
+                     VirtualReport._text(finding.bosch_text))
+            details = [[ref(label), VirtualReport._text(value)]
+                       for label, value in finding.details]
+            value = None
+        else:
+            customer_file = bosch_file = None
+            texts = (None, None)
+            details = []
+            value = finding.render_value()
+        return [int(finding.row), VirtualReport._scalar(finding.object_id),
+                ref(finding.rule_id), ref(finding.attribute), ref(finding.issue),
+                ref(finding.severity), ref(finding.id_column),
+                ref(customer_file), ref(bosch_file),
+                1 if finding.bosch_first else 0,
+                texts[0], texts[1], details, value]
+
+    @staticmethod
+    def _text(value):
+        # Missing values read 'nan', as in the other report types
+        return value if isinstance(value, str) else f"{value}"
+
+    @staticmethod
+    def _scalar(value):
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+        return VirtualReport._text(value)
+
+    @staticmethod
+    def _dumps(value):
+        # '</' would end the script element that embeds the JSON
+        return json.dumps(value, ensure_ascii=False,
+                          separators=(',', ':')).replace('</', '<\\/')
+
+    @staticmethod
+    def _header(file_name, total_issues):
+        max_filename_length = 50
+        truncated_filename = file_name[:max_filename_length] + "..." if len(
+            file_name) > max_filename_length else file_name
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Analysis Report - {truncated_filename}</title>
+<style>{_STYLE}</style>
+</head>
+<body>
+<div class="container">
+<h2>📋 Report for the File: {truncated_filename}</h2>
+<p><strong>Total Findings:</strong> {total_issues} (shown: <span id="shown">0</span>)</p>
+<div class="controls">
+<input id="filter" type="search" placeholder="Filter by row, check, attribute, ID or text">
+<select id="check"><option value="">All checks</option></select>
+</div>
+<div id="viewport"><div id="spacer"></div></div>
+<div id="detail"><p>Select a finding to show its details.</p></div>
+"""
+
+    @staticmethod
+    def _footer():
+        return f"""<div class="footer">
+Generated by Import/Export Checker | Date: {datetime.now().strftime('%Y-%m-%d')}
+</div>
+</div>
+</body>
+</html>"""
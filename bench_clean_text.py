@@ -0,0 +1,81 @@
+"""
+Throughput of the XHTML cleaning used by the ReqIF to Excel conversion.
+
+Compares the former multi-pass clean_text (three re.sub passes followed by
+html.unescape) with the single-pass reqif_text.clean_text and the bulk
+reqif_text.clean_texts, on the raw attribute values of a REQIF document.
+
+Usage:
+    python bench_clean_text.py <file.reqif or file.reqifz> [repeats]
+"""
+import html
+import re
+import sys
+import time
+
+from reqif_archive import ReqIFArchiveReader
+from reqif_stream import ReqIFStreamParser
+from reqif_text import clean_text, clean_texts
+
+
+def legacy_clean_text(raw_text):
+    """The multi-pass implementation clean_text replaced."""
+    if not raw_text:
+        return ""
+    raw_text = re.sub(r'<[^>]+?/>', '', raw_text)
+    raw_text = re.sub(r'<[^>]+>', '', raw_text)
+    raw_text = re.sub(r'\s+', ' ', raw_text)
+    return html.unescape(raw_text)
+
+
+def load_values(file_path):
+    """Return the raw (uncleaned) attribute values of all requirements."""
+    def values_of(source):
+        parser = ReqIFStreamParser(source)
+        return [value for requirement in parser.iter_requirements()
+                for name, value in requirement.items() if name != 'reqifId']
+
+    if file_path.endswith('.reqifz') or file_path.endswith('.zip'):
+        values = []
+        for _, stream in ReqIFArchiveReader(file_path).iter_reqif():
+            values += values_of(stream)
+        return values
+    return values_of(file_path)
+
+
+def measure(function, repeats):
+    """Return the best run time of function and its result."""
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(file_path, repeats=3):
+    values = load_values(file_path)
+    size_mb = sum(len(value.encode('utf-8')) for value in values) / 1e6
+    print(f"{len(values)} values, {size_mb:.1f} MB of XHTML")
+
+    candidates = [
+        ("legacy clean_text", lambda: [legacy_clean_text(v) for v in values]),
+        ("single-pass clean_text", lambda: [clean_text(v) for v in values]),
+        ("bulk clean_texts", lambda: clean_texts(values)),
+    ]
+    reference = None
+    for name, function in candidates:
+        elapsed, result = measure(function, repeats)
+        if reference is None:
+            reference = result
+        status = "identical" if result == reference else "DIFFERENT OUTPUT"
+        print(f"{name:24s} {elapsed:7.3f} s  {size_mb / elapsed:8.1f} MB/s  {status}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 3)
@@ -12,6 +12,65 @@ class CheckConfiguration:
 
     REPORT_FOLDER = os.path.join(os.getcwd(), "report")
 
+    # Number of worker processes used to check the files of a folder (1 = sequential)
+    CHECK_WORKERS = 1
+
+    # Version of the ReqIF to Excel conversion; bump it whenever the converted
+    # sheets change so that cached sheets of older conversions are not reused
+    CONVERTER_VERSION = "4"
+
+    # Only reconvert ReqIF archives that changed since the last conversion
+    INCREMENTAL_CONVERSION = False
+
+    # Read .reqif/.xml files straight from the archives instead of extracting them
+    # (the reqif folder then stays empty)
+    IN_MEMORY_ARCHIVES = False
+
+    # Number of worker processes extracting and converting archives (1 = sequential)
+    CONVERSION_WORKERS = 1
+
+    # Identifier columns that are always loaded, even if no check reads them
+    IDENTIFIER_COLUMNS = ['Object ID', 'ReqIF.ForeignID']
+
+    # Enum columns holding a few dozen distinct values; they are loaded as
+    # categoricals with categories shared across files (see
+    # HelperFunctions.to_categorical)
+    CATEGORICAL_COLUMNS = ['CR-Status_Bosch_PPx',
+                           'BRS-1Box_Status_Hersteller_Bosch_PPx',
+                           'BRS-1Box_Status_Zulieferer_Bosch_PPx',
+                           'Typ', 'RB_AS_Status', 'Status OEM zu Lieferant R']
+
+    # Cache of sheets already read from converted Excel files
+    SHEET_CACHE_ENABLED = True
+    SHEET_CACHE_FOLDER = os.path.join(os.getcwd(), "cache", "sheets")
+    SHEET_CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+
+    # Persisted indexed stores of compare files (see CompareStore)
+    COMPARE_CACHE_FOLDER = os.path.join(os.getcwd(), "cache", "compare")
+
+    # Highlighting of text differences in the reports (see TextDiff.TextDiffer):
+    # 'word' diffs words, 'char' single characters (slow on long texts)
+    DIFF_MODE = "word"
+    # Text pairs whose token counts multiply to more than this are highlighted
+    # as a whole instead of being diffed (0 = no limit)
+    DIFF_MAX_COST = 4_000_000
+    # Diffs are reused across runs from this file (None = no persistent cache)
+    DIFF_CACHE_FILE = os.path.join(os.getcwd(), "cache", "diffs.sqlite")
+    DIFF_CACHE_MAX_ENTRIES = 200_000
+
+    # Pair rows whose 'Object ID' is missing in the compare file with the most
+    # similar 'Object Text' there (see SimilarityMatcher), e.g. after the
+    # customer re-imported a module with new IDs. Pairs are reported if the
+    # Jaccard similarity of their texts reaches the threshold.
+    SIMILARITY_MATCHING = False
+    SIMILARITY_THRESHOLD = 0.8
+
+    # Attributes left out when comparing two ReqIF documents (see ReqIFCompare)
+    REQIF_COMPARE_IGNORED_ATTRIBUTES = []
+
+    # Findings per page of the paged HTML report (report type 'HTML_Paged')
+    REPORT_PAGE_SIZE = 500
+
 
     IMPORT_FOLDERS = {
         IMPORT_CHECK: r"D:\AUDI\Import_Reqif2Excel_Converted",
@@ -0,0 +1,88 @@
+import io
+import zipfile
+
+# Archive members that contain requirements
+REQIF_EXTENSIONS = ('.reqif', '.xml')
+# Archive members that are archives themselves
+ARCHIVE_EXTENSIONS = ('.zip', '.reqifz')
+
+
+class ReqIFArchiveReader:
+    """
+    Reads the ReqIF documents of a .reqifz/.zip archive without extracting it.
+
+    Nested archives are opened in memory and only .reqif/.xml members are
+    decompressed, as streams, so attachments such as OLE objects and images
+    are never written to disk.
+    """
+
+    def __init__(self, file_path):
+        """
+        Args:
+            file_path (str): Path to the .reqifz or .zip archive
+        """
+        self.file_path = file_path
+
+    def iter_reqif(self):
+        """
+        Yield the ReqIF documents of the archive, including nested archives.
+
+        Yields:
+            tuple: Member name and a binary stream of its content. The stream
+                   is only valid until the next item is requested.
+        """
+        if not zipfile.is_zipfile(self.file_path):
+            print(f"Skipping invalid zip file: {self.file_path}")
+            return
+        yield from self._iter_archive(self.file_path, self.file_path)
+
+    def _iter_archive(self, source, name):
+        try:
+            with zipfile.ZipFile(source, 'r') as zip_ref:
+                for info in zip_ref.infolist():
+                    if info.is_dir():
+                        continue
+                    member = info.filename.lower()
+                    if member.endswith(REQIF_EXTENSIONS):
+                        with zip_ref.open(info) as stream:
+                            yield info.filename, stream
+                    elif member.endswith(ARCHIVE_EXTENSIONS):
+                        # ZipFile needs a seekable file, nested archives are
+                        # therefore read into memory instead of to disk
+                        nested = io.BytesIO(zip_ref.read(info))
+                        yield from self._iter_archive(nested, info.filename)
+
+        except zipfile.BadZipFile:
+            print(f"Error: {name} is not a valid zip file.")
+
+    def open_reqif(self):
+        """
+        Open the first .reqif document of the archive, searching nested archives too.
+
+        Returns:
+            file: Binary stream of the document (its name attribute is the
+                  member name); the caller has to close it
+
+        Raises:
+            ValueError: If the archive does not contain a .reqif file
+        """
+        stream = None
+        if zipfile.is_zipfile(self.file_path):
+            stream = self._open_first_reqif(self.file_path)
+        if stream is None:
+            raise ValueError(f"No .reqif file found in {self.file_path}")
+        return stream
+
+    def _open_first_reqif(self, source):
+        with zipfile.ZipFile(source, 'r') as zip_ref:
+            for info in zip_ref.infolist():
+                member = info.filename.lower()
+                if member.endswith('.reqif'):
+                    # The stream stays readable after the archive is closed
+                    return zip_ref.open(info)
+                if member.endswith(ARCHIVE_EXTENSIONS):
+                    stream = self._open_first_reqif(
+                        io.BytesIO(zip_ref.read(info)))
+                    if stream is not None:
+                        return stream
+        return None
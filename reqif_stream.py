@@ -0,0 +1,198 @@
+from lxml import etree
+
+from HelperFunc import FINGERPRINT_COLUMN, HelperFunctions
+
+# Elements handled by the parser, matched in any namespace (ReqIF and RIF)
+_EVENT_TAGS = ['{*}DATATYPE-DEFINITION-ENUMERATION', '{*}SPEC-OBJECT-TYPE',
+               '{*}SPEC-TYPE', '{*}SPEC-OBJECT', '{*}SPEC-OBJECT-REF',
+               '{*}SPEC-HIERARCHY', '{*}SPEC-RELATION']
+
+
+def _local_name(tag):
+    """Return the tag name without its namespace."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _find(element, *path):
+    """Find a descendant by a path of local tag names, ignoring namespaces."""
+    return element.find('/'.join('{*}' + name for name in path))
+
+
+def _children(element):
+    """Iterate over the child elements, skipping comments and processing instructions."""
+    if element is None:
+        return iter(())
+    return element.iterchildren(tag=etree.Element)
+
+
+def _first_child(element):
+    return next(_children(element), None)
+
+
+def _get_value(element, name):
+    """Return an XML attribute (ReqIF) or the text of a child element (RIF)."""
+    if name in element.attrib:
+        return element.attrib[name]
+    child = _find(element, name)
+    return child.text if child is not None else None
+
+
+class ReqIFStreamParser:
+    """
+    Incremental parser for ReqIF/RIF documents.
+
+    Unlike pyreqif.reqif.load, the document is never held in memory as a whole:
+    SPEC-OBJECTs are emitted one at a time as flat dictionaries and released
+    right after. Datatypes and spec types precede the SPEC-OBJECTS section, so
+    attribute definitions and enum values are resolved along the way.
+
+    The values match the pyreqif based conversion: enum values are the long
+    names followed by ',', all other values are passed through clean_text.
+    With fingerprints=True each requirement also gets its content fingerprint
+    (HelperFunctions.requirement_fingerprint) as 'ReqIF.Fingerprint'.
+    Requirements are emitted in document order, not in SPEC-HIERARCHY order;
+    the hierarchy is available in self.hierarchy once parsing has finished.
+    """
+
+    def __init__(self, source, clean_text=None, fingerprints=False):
+        """
+        Args:
+            source (str or file): Path or binary file object of the ReqIF/RIF document
+            clean_text (callable, optional): Applied to every non-enum value
+            fingerprints (bool, optional): Add the fingerprint of every requirement
+        """
+        self.source = source
+        self.clean_text = clean_text
+        self.fingerprints = fingerprints
+        self.fields = []  # Attribute long names in pyreqif column order
+        self.hierarchy = []  # (SPEC-OBJECT identifier, depth) in pre-order
+        self._enum_values = {}  # datatype id -> {enum value id: long name}
+        self._attributes = {}  # spec type id -> {attribute id: (long name, enum datatype id)}
+        self._defaults = {}  # spec type id -> {long name: default value}
+
+    def iter_requirements(self):
+        """
+        Parse the document and yield one dictionary per SPEC-OBJECT.
+
+        Yields:
+            dict: Attribute long name -> value, plus the object identifier as
+                  'reqifId' (and the fingerprint as 'ReqIF.Fingerprint')
+        """
+        for _, element in etree.iterparse(self.source, events=('end',),
+                                          tag=_EVENT_TAGS,
+                                          huge_tree=True):
+            name = _local_name(element.tag)
+            if name == 'SPEC-OBJECT':
+                yield self._requirement(element)
+                self._release(element)
+            elif name == 'SPEC-OBJECT-REF':
+                self._add_hierarchy_entry(element)
+            elif name == 'DATATYPE-DEFINITION-ENUMERATION':
+                self._add_enumeration(element)
+                self._release(element)
+            elif name in ('SPEC-OBJECT-TYPE', 'SPEC-TYPE'):
+                self._add_spec_type(element)
+                self._release(element)
+            elif name in ('SPEC-HIERARCHY', 'SPEC-RELATION'):
+                self._release(element)
+
+    @staticmethod
+    def _release(element):
+        """Free a processed element so memory does not grow with the document."""
+        element.clear()
+        parent = element.getparent()
+        if parent is not None:
+            parent.remove(element)
+
+    def _add_hierarchy_entry(self, element):
+        """Record a SPEC-HIERARCHY/OBJECT/SPEC-OBJECT-REF in pre-order."""
+        parent = element.getparent()
+        if parent is None or _local_name(parent.tag) != 'OBJECT':
+            return  # References from SPEC-RELATIONS or SPEC-GROUPS
+        # OBJECT precedes CHILDREN, so the end of this element is reached
+        # before any child of its SPEC-HIERARCHY
+        depth = sum(1 for ancestor in parent.iterancestors()
+                    if _local_name(ancestor.tag) == 'SPEC-HIERARCHY') - 1
+        self.hierarchy.append((element.text, depth))
+
+    def _add_enumeration(self, element):
+        values = {}
+        specified_values = _find(element, 'SPECIFIED-VALUES')
+        if specified_values is not None:
+            for enum_value in _children(specified_values):
+                values[_get_value(enum_value, 'IDENTIFIER')] = _get_value(
+                    enum_value, 'LONG-NAME')
+        self._enum_values[_get_value(element, 'IDENTIFIER')] = values
+
+    def _add_spec_type(self, element):
+        type_id = _get_value(element, 'IDENTIFIER')
+        attributes = self._attributes.setdefault(type_id, {})
+        defaults = self._defaults.setdefault(type_id, {})
+        for attribute in _children(_find(element, 'SPEC-ATTRIBUTES')):
+            long_name = _get_value(attribute, 'LONG-NAME')
+            enum_type = None
+            if _local_name(attribute.tag) == 'ATTRIBUTE-DEFINITION-ENUMERATION':
+                type_ref = _find(attribute, 'TYPE',
+                                 'DATATYPE-DEFINITION-ENUMERATION-REF')
+                enum_type = type_ref.text if type_ref is not None else None
+                default = _find(attribute, 'DEFAULT-VALUE',
+                                'ATTRIBUTE-VALUE-ENUMERATION', 'VALUES',
+                                'ENUM-VALUE-REF')
+                if default is not None:
+                    # pyreqif writes defaults without the trailing ','
+                    defaults[long_name] = self._enum_values.get(
+                        enum_type, {}).get(default.text, "")
+            attributes[_get_value(attribute, 'IDENTIFIER')] = (long_name,
+                                                               enum_type)
+            if long_name not in self.fields:
+                self.fields.append(long_name)
+
+    def _requirement(self, element):
+        type_ref = _first_child(_find(element, 'TYPE'))
+        type_id = type_ref.text if type_ref is not None else None
+        attributes = self._attributes.get(type_id, {})
+
+        requirement = dict(self._defaults.get(type_id, {}))
+        for value in _children(_find(element, 'VALUES')):
+            definition = _first_child(_find(value, 'DEFINITION'))
+            if definition is None:
+                continue
+            attribute = attributes.get(definition.text)
+            if attribute is None:
+                continue
+
+            long_name, enum_type = attribute
+            if _local_name(value.tag) == 'ATTRIBUTE-VALUE-ENUMERATION':
+                enum_values = self._enum_values.get(enum_type, {})
+                requirement[long_name] = "".join(
+                    enum_values[ref.text] + ","
+                    for ref in _children(_find(value, 'VALUES'))
+                    if ref.text in enum_values)
+            else:
+                requirement[long_name] = self._content(value)
+
+        requirement['reqifId'] = _get_value(element, 'IDENTIFIER')
+        if self.fingerprints:
+            requirement[FINGERPRINT_COLUMN] = HelperFunctions.requirement_fingerprint(
+                requirement)
+        return requirement
+
+    def _content(self, value):
+        """Return the (cleaned) content of a non-enum attribute value."""
+        if 'THE-VALUE' in value.attrib:
+            content = value.attrib['THE-VALUE']
+        else:
+            container = _find(value, 'THE-VALUE')
+            if container is None:
+                container = _find(value, 'XHTML-CONTENT')
+            xhtml = _first_child(container)
+            if xhtml is None:
+                return ""
+            # ASCII serialization keeps non-ASCII characters as entities,
+            # exactly like the serialization pyreqif uses
+            content = etree.tostring(xhtml, encoding='us-ascii',
+                                     with_tail=False).decode('ascii')
+
+        if self.clean_text is not None:
+            content = self.clean_text(content)
+        return content
@@ -0,0 +1,89 @@
+import html
+import re
+from functools import lru_cache
+
+# Tags are removed and whitespace is collapsed, also across tags, so that
+# 'a <br/> b' becomes 'a b' and 'a<b>b</b>' becomes 'ab'
+_TAG = r'<[^>\x00]+>'
+_TAGS = rf'(?:{_TAG})*'
+# Character reference in the syntax html.unescape accepts. It may be
+# interrupted by tags (tag removal used to run before decoding) and ends at
+# whitespace (whitespace used to be collapsed before decoding)
+_REFERENCE = (rf'{_TAGS}#{_TAGS}[0-9](?:{_TAGS}[0-9])*(?:{_TAGS};)?'
+              rf'|{_TAGS}#{_TAGS}[xX]{_TAGS}[0-9a-fA-F](?:{_TAGS}[0-9a-fA-F])*(?:{_TAGS};)?'
+              rf'|(?:{_TAGS}[^\s<&#;\x00]){{1,32}}(?:{_TAGS};)?')
+# One scan finds every token that changes the text. The pattern starts with a
+# character class, so the regex engine skips plain text without trying the
+# alternatives; the look-behinds select the alternative for the character
+# consumed first:
+#   '<':  a run of tags, with whitespace after the first tag in group 1
+#   '&':  a character reference in group 2
+#   \s:   a run of whitespace and tags; a single ' ' before plain text is
+#         already collapsed and is skipped to avoid a needless replacement
+# \x00 is excluded everywhere, it separates the values of the bulk API
+_TOKEN = re.compile(
+    rf'[<&\s](?:(?<=<)[^>\x00]+>{_TAGS}(\s(?:{_TAG}|\s)*)?'
+    rf'|(?<=&)({_REFERENCE})'
+    rf'|(?<=\s)(?!(?<= )[^<\s])(?:{_TAG}|\s)*)')
+_TAG_PATTERN = re.compile(_TAG)
+
+# Values of the bulk API are joined with this character; XML 1.0 documents
+# cannot contain it
+_SEPARATOR = '\x00'
+
+
+@lru_cache(maxsize=4096)
+def _decode_reference(reference):
+    if '<' in reference:
+        reference = _TAG_PATTERN.sub('', reference)
+    return html.unescape('&' + reference)
+
+
+def _replace_token(match):
+    group = match.lastindex
+    if group is None:
+        # Tags only, or whitespace (and tags)
+        return '' if match.group()[0] == '<' else ' '
+    if group == 1:
+        return ' '
+    return _decode_reference(match.group(2))
+
+
+def clean_text(raw_text):
+    """
+    Convert an XHTML value to plain text in a single scan.
+
+    Tags are removed, whitespace runs (including runs interrupted by tags) are
+    collapsed to one space and character references are decoded. The result
+    equals the former sequence of re.sub passes followed by html.unescape;
+    references decode to text that is not scanned again, so '&lt;b&gt;'
+    stays '<b>'. Leading and trailing whitespace is kept as a single space.
+
+    Args:
+        raw_text (str): The raw text with HTML tags and encoded entities.
+
+    Returns:
+        str: The cleaned text.
+    """
+    if not raw_text:
+        return ""
+    return _TOKEN.sub(_replace_token, raw_text)
+
+
+def clean_texts(values):
+    """
+    Clean many values at once, e.g. all attribute values of a specification.
+
+    The values are joined and cleaned in one regex scan, which avoids the
+    per-call overhead of clean_text for the many short values of a document.
+
+    Args:
+        values (list): Raw XHTML values; empty values and None become ""
+
+    Returns:
+        list: Cleaned texts, in the order of values
+    """
+    values = [value if value else "" for value in values]
+    if not values:
+        return []
+    return _TOKEN.sub(_replace_token, _SEPARATOR.join(values)).split(_SEPARATOR)
@@ -3,6 +3,8 @@ import shutil
 import tempfile
 import zipfile
 
+from reqif_archive import ReqIFArchiveReader
+
 
 class ReqIFProcessor:
     def __init__(self):
@@ -75,6 +77,41 @@ class ReqIFProcessor:
             self.cleanup_temp_dirs()
             raise e
 
+    def open_reqif_files(self, customer_reqif_path, own_reqif_path):
+        """
+        Opens the .reqif documents of both inputs as streams, without extracting anything.
+        Input paths are handled like in extract_reqifz_files: a directory is searched
+        for a .reqif or .reqifz file, a .reqifz file is read in memory (including
+        nested archives) and a .reqif file is opened directly.
+        The caller has to close the returned streams.
+        """
+        def find_reqif_file(directory):
+            """Finds a .reqif or .reqifz file in the given directory."""
+            for file_name in os.listdir(directory):
+                if file_name.endswith('.reqif') or file_name.endswith('.reqifz'):
+                    return os.path.join(directory, file_name)
+            raise ValueError(f"No .reqif or .reqifz file found in {directory}")
+
+        def open_reqif(file_path):
+            """Opens a .reqif file or the .reqif document inside a .reqifz file."""
+            if os.path.isdir(file_path):
+                file_path = find_reqif_file(file_path)
+            if file_path.endswith('.reqifz'):
+                return ReqIFArchiveReader(file_path).open_reqif()
+            elif file_path.endswith('.reqif'):
+                return open(file_path, 'rb')
+            else:
+                raise ValueError(f"Unsupported file type: {file_path}")
+
+        customer_reqif_file = open_reqif(customer_reqif_path)
+        try:
+            own_reqif_file = open_reqif(own_reqif_path)
+        except Exception as e:
+            print(f"Error opening .reqif files: {e}")
+            customer_reqif_file.close()
+            raise e
+        return customer_reqif_file, own_reqif_file
+
     def cleanup_temp_dirs(self):
         """Cleans up temporary directories."""
         if self.customer_temp_dir and os.path.exists(self.customer_temp_dir):